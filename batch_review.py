@@ -0,0 +1,213 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from preferences import load_preferences
+from victory_history import VictoryHistory
+
+# Wins that still need a decision: never posted or prepared, and not dismissed
+REVIEW_STATUSES = (VictoryHistory.PENDING, VictoryHistory.GENERATED, VictoryHistory.MANUAL, VictoryHistory.FAILED)
+
+
+class BatchReviewer:
+    """
+    Review-and-post mode for wins saved with the review_later preference.
+
+    Loads every win still waiting in the victory history, generates the
+    missing posts concurrently (LLM calls are network-bound), asks for
+    approval one by one, then posts the approved ones sequentially through a
+    single LinkedInPoster, so Chrome starts and logs in once per batch
+    instead of once per win. Approved wins are claimed in the history before
+    posting, so a win the live detector's job workers are still retrying is
+    skipped instead of posted twice.
+    """
+
+    def __init__(self, history, preferences, generator=None, workers=4):
+        self.history = history
+        self.preferences = preferences
+        self.generator = generator
+        self.workers = workers
+        self.timings = {}
+
+    def pending(self, since=None):
+        return self.history.by_status(REVIEW_STATUSES, since=since)
+
+    def ask_details(self, records):
+        """Extra game details per win, asked up front so generation can run unattended"""
+        details = {}
+        if not self.preferences.get('request_extra_details'):
+            return details
+        for record in records:
+            print(f"\n🎮 Details for #{record['id']} ({os.path.basename(record['image_path'] or '')}), Enter to skip:")
+            kills = input("  Eliminations: ").strip()
+            mode = input("  Game mode (Solos/Duos/Squads/etc): ").strip()
+            extra_details = {'placement': 1}
+            if kills.isdigit():
+                extra_details['kills'] = int(kills)
+            if mode:
+                extra_details['mode'] = mode
+            details[record['id']] = extra_details
+        return details
+
+    def generate_missing(self, records):
+        """Generate posts for wins without one, several at a time; returns how many were generated"""
+        missing = [record for record in records if not record['post_text']]
+        if not missing:
+            return 0
+        if self.generator is None:
+            print(f"⚠️ {len(missing)} win(s) have no post and the LLM isn't available (set OPENAI_API_KEY)")
+            return 0
+
+        details = self.ask_details(missing)
+        personality = self.preferences.get('personality_mode', 'business_bro')
+        print(f"\n📝 Generating {len(missing)} post(s) with {self.workers} concurrent request(s)...")
+
+        start = time.perf_counter()
+        generated = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(self.generator.generate_post, personality=personality,
+                                extra_details=details.get(record['id'])): record
+                for record in missing
+            }
+            for future in as_completed(futures):
+                record = futures[future]
+                post_text = future.result()
+                if post_text:
+                    self.history.set_post(record['id'], personality, post_text)
+                    generated += 1
+        self.timings['generate'] = time.perf_counter() - start
+        return generated
+
+    def review(self, records, approve_all=False):
+        """Show each post and ask what to do with it; returns the approved records"""
+        approved = []
+        for index, record in enumerate(records, 1):
+            if not record['post_text']:
+                continue
+            when = datetime.fromtimestamp(record['detected_at']).strftime("%Y-%m-%d %H:%M")
+            print("\n" + "=" * 60)
+            print(f"[{index}/{len(records)}] Victory #{record['id']} - {when} - {record['image_path']}")
+            print("=" * 60)
+            print(record['post_text'])
+            print("=" * 60)
+            if approve_all:
+                approved.append(record)
+                continue
+
+            choice = input("  Post it? [y]es / [n]o, keep for later / [d]ismiss: ").strip().lower()
+            if choice == 'y':
+                approved.append(record)
+            elif choice == 'd':
+                self.history.set_status(record['id'], VictoryHistory.DISMISSED, "review: dismissed")
+        return approved
+
+    def post(self, records):
+        """Post approved wins one after another through one browser session; returns how many succeeded"""
+        claimed = [record for record in records if self.history.claim(record['id'], REVIEW_STATUSES)]
+        if len(claimed) < len(records):
+            print(f"⏭️ Skipping {len(records) - len(claimed)} win(s) already being posted or done")
+        if not claimed:
+            return 0
+        records = claimed
+        # Claims not settled by set_status() (no login, Ctrl+C) go back to their old status
+        unsettled = {record['id']: record['post_status'] for record in records}
+        from linkedin_poster import LinkedInPoster
+
+        full_auto = self.preferences.get('linkedin_automation') == 'full-auto'
+        mode = 'full-auto' if full_auto else 'semi-auto'
+        poster = LinkedInPoster(headless=False)
+        posted = 0
+        try:
+            start = time.perf_counter()
+            logged_in = poster.login()
+            self.timings['browser start + login'] = time.perf_counter() - start
+            if not logged_in:
+                print("❌ Not logged in to LinkedIn, nothing posted")
+                return 0
+
+            start = time.perf_counter()
+            for index, record in enumerate(records, 1):
+                print(f"\n🚀 [{index}/{len(records)}] Posting victory #{record['id']}...")
+                image_path = record['image_path'] if record['image_path'] and os.path.exists(record['image_path']) else None
+                try:
+                    success = poster.post_to_linkedin(record['post_text'], image_path, full_auto=full_auto)
+                except Exception as e:
+                    print(f"❌ LinkedIn automation error: {e}")
+                    success = False
+                if success:
+                    posted += 1
+                    status = VictoryHistory.POSTED if full_auto else VictoryHistory.PREPARED
+                    self.history.set_status(record['id'], status, f"batch {mode}: {status}")
+                else:
+                    self.history.set_status(record['id'], VictoryHistory.FAILED, f"batch {mode}: failed")
+                del unsettled[record['id']]
+            self.timings['posting'] = time.perf_counter() - start
+        finally:
+            poster.close()
+            for victory_id, status in unsettled.items():
+                self.history.release(victory_id, status)
+        return posted
+
+    def run(self, since=None, approve_all=False):
+        start = time.perf_counter()
+        stale = self.history.release_stale_claims()
+        if stale:
+            print(f"🗂️ {stale} win(s) left mid-post by an earlier run are back in the queue")
+        records = self.pending(since)
+        if not records:
+            print("✅ No wins waiting for review")
+            return
+        print(f"🗂️ {len(records)} win(s) waiting for review")
+
+        generated = self.generate_missing(records)
+        records = [self.history.get(record['id']) for record in records]
+        approved = self.review(records, approve_all)
+        posted = self.post(approved)
+        self.report(len(records), generated, len(approved), posted, time.perf_counter() - start)
+
+    def report(self, wins, generated, approved, posted, elapsed):
+        print("\n📈 Batch summary:")
+        print(f"   {wins} win(s): {generated} post(s) generated, {approved} approved, {posted} posted")
+        if 'generate' in self.timings and generated:
+            seconds = self.timings['generate']
+            print(f"   Generation: {seconds:.1f}s ({generated / seconds * 60:.1f} posts/min, "
+                  f"{self.workers} concurrent)")
+        if 'browser start + login' in self.timings:
+            print(f"   Browser start + login: {self.timings['browser start + login']:.1f}s (once for the batch)")
+        if 'posting' in self.timings and approved:
+            seconds = self.timings['posting']
+            print(f"   Posting: {seconds:.1f}s ({seconds / approved:.1f}s per post)")
+        print(f"   Wall clock: {elapsed:.1f}s for {wins} win(s) "
+              f"({wins / elapsed * 60:.1f} wins/min, review time included)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Review saved wins and post the approved ones in one browser session")
+    parser.add_argument('--days', type=float, default=None, help="Only wins from the last N days")
+    parser.add_argument('--workers', type=int, default=4, help="Posts generated at the same time")
+    parser.add_argument('--approve-all', action='store_true', help="Post every generated post without asking")
+    args = parser.parse_args()
+
+    generator = None
+    try:
+        from llm_post_generator import LinkedInPostGenerator
+        generator = LinkedInPostGenerator()
+    except Exception as e:
+        print(f"⚠️ LLM not available: {e}")
+
+    history = VictoryHistory()
+    reviewer = BatchReviewer(history, load_preferences(), generator=generator, workers=args.workers)
+    since = time.time() - args.days * 86400 if args.days else None
+    try:
+        reviewer.run(since=since, approve_all=args.approve_all)
+    except KeyboardInterrupt:
+        print("\n🛑 Review stopped - unreviewed wins stay in the queue")
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
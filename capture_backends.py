@@ -0,0 +1,349 @@
+import glob
+import os
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+FORTNITE_TITLES = ("Fortnite", "FortniteClient-Win64-Shipping")
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class CaptureBackend:
+    """
+    Long-lived screen capture session.
+
+    grab() returns a BGR frame and records how long it took. Frames are written
+    into a small ring of preallocated buffers, so a returned frame stays valid
+    for buffer_count - 1 further grabs. A frame that has to live longer (one
+    waiting for or in analysis) is lent: its buffer is skipped by later grabs
+    until give_back(), and the ring grows if every buffer is out.
+    """
+
+    name = 'base'
+
+    def __init__(self, buffer_count=4):
+        self.buffer_count = buffer_count
+        self.buffers = []
+        self.next_buffer = 0
+        self.lent = []  # Buffers grabs must not write into, see lend()
+        self.lent_lock = threading.Lock()
+        self.window_found = True
+
+        self.frames = 0
+        self.capture_time = 0.0
+        self.max_capture_time = 0.0
+
+    def frame_buffer(self, height, width):
+        """Next preallocated BGR buffer that isn't lent out, reallocated only when the capture size changes"""
+        if not self.buffers or self.buffers[0].shape[:2] != (height, width):
+            self.buffers = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(self.buffer_count)]
+            self.next_buffer = 0
+        with self.lent_lock:
+            for _ in range(len(self.buffers)):
+                buffer = self.buffers[self.next_buffer]
+                self.next_buffer = (self.next_buffer + 1) % len(self.buffers)
+                if not any(buffer is frame for frame in self.lent):
+                    return buffer
+        # Every buffer is held by the analysis side
+        buffer = np.empty((height, width, 3), dtype=np.uint8)
+        self.buffers.append(buffer)
+        return buffer
+
+    def lend(self, frame):
+        """Keep a grabbed frame from being overwritten until give_back(frame)"""
+        with self.lent_lock:
+            self.lent.append(frame)
+
+    def give_back(self, frame):
+        with self.lent_lock:
+            self.lent = [buffer for buffer in self.lent if buffer is not frame]
+
+    def bgra_to_bgr(self, bgra):
+        """The one color conversion per frame, straight into a reused buffer"""
+        height, width = bgra.shape[:2]
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=self.frame_buffer(height, width))
+
+    def grab(self):
+        start = time.perf_counter()
+        frame = self.capture()
+        elapsed = time.perf_counter() - start
+        if frame is not None:
+            self.frames += 1
+            self.capture_time += elapsed
+            self.max_capture_time = max(self.max_capture_time, elapsed)
+        return frame
+
+    def capture(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    @property
+    def average_ms(self):
+        return self.capture_time / self.frames * 1000 if self.frames else 0.0
+
+    def summary(self):
+        return (f"Capture ({self.name}): {self.frames} frames, "
+                f"avg {self.average_ms:.1f} ms, max {self.max_capture_time * 1000:.1f} ms")
+
+
+class MSSCapture(CaptureBackend):
+    """
+    Full-monitor capture through mss (X11 on Linux, GDI on Windows, CoreGraphics on macOS).
+
+    An mss session only works on the thread that opened it, so each thread
+    that captures gets its own, opened on its first grab. close() closes all
+    of them once capturing has stopped.
+    """
+
+    name = 'mss'
+
+    def __init__(self, monitor=1, buffer_count=4):
+        super().__init__(buffer_count)
+        self.monitor = monitor
+        self.local = threading.local()
+        self.sessions = []
+        self.sessions_lock = threading.Lock()
+
+    def session(self):
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            import mss
+            session = self.local.session = mss.mss()
+            with self.sessions_lock:
+                self.sessions.append(session)
+        return session
+
+    def capture(self):
+        session = self.session()
+        shot = session.grab(session.monitors[self.monitor])
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return self.bgra_to_bgr(bgra)
+
+    def close(self):
+        with self.sessions_lock:
+            sessions, self.sessions = self.sessions, []
+        for session in sessions:
+            session.close()
+        self.local = threading.local()
+
+
+class PyAutoGUICapture(CaptureBackend):
+    """Full-screen capture through pyautogui/PIL, the slowest option"""
+
+    name = 'pyautogui'
+
+    def capture(self):
+        import pyautogui
+        rgb = np.asarray(pyautogui.screenshot())
+        height, width = rgb.shape[:2]
+        return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=self.frame_buffer(height, width))
+
+
+class Win32WindowCapture(CaptureBackend):
+    """
+    Fortnite window capture through GDI with a persistent session.
+
+    The window handle is kept while it stays valid and visible, and the window
+    DC, memory DC and bitmap are only recreated when the window or its size
+    changes. Each grab is a BitBlt, GetBitmapBits and one BGRA -> BGR
+    conversion. While the window isn't found, the full screen is captured
+    with the fallback backend.
+    """
+
+    name = 'win32'
+
+    def __init__(self, titles=FORTNITE_TITLES, buffer_count=4, fallback=None):
+        super().__init__(buffer_count)
+        import win32gui
+        import win32ui
+        import win32con
+        self.win32gui = win32gui
+        self.win32ui = win32ui
+        self.win32con = win32con
+
+        self.titles = [title.lower() for title in titles]
+        self.hwnd = None
+        self.size = None
+        self.window_dc = None
+        self.mfc_dc = None
+        self.save_dc = None
+        self.bitmap = None
+        self.fallback = fallback or (MSSCapture(buffer_count=buffer_count) if _has_module('mss')
+                                     else PyAutoGUICapture(buffer_count=buffer_count))
+
+    def find_window(self):
+        """Return the cached handle if it's still usable, otherwise enumerate windows again"""
+        win32gui = self.win32gui
+        if self.hwnd and win32gui.IsWindow(self.hwnd) and win32gui.IsWindowVisible(self.hwnd):
+            return self.hwnd
+
+        def enum_windows_callback(hwnd, handles):
+            window_title = win32gui.GetWindowText(hwnd).lower()
+            if any(title in window_title for title in self.titles) and win32gui.IsWindowVisible(hwnd):
+                handles.append(hwnd)
+                return False
+            return True
+
+        handles = []
+        try:
+            win32gui.EnumWindows(enum_windows_callback, handles)
+        except Exception:
+            pass  # EnumWindows raises when the callback stops enumeration early
+
+        hwnd = handles[0] if handles else None
+        if hwnd != self.hwnd:
+            self.release_session()
+            self.hwnd = hwnd
+            print("📱 Capturing Fortnite window" if hwnd else "🖥️ Capturing full screen (Fortnite window not found)")
+        return hwnd
+
+    def open_session(self, width, height):
+        self.window_dc = self.win32gui.GetWindowDC(self.hwnd)
+        self.mfc_dc = self.win32ui.CreateDCFromHandle(self.window_dc)
+        self.save_dc = self.mfc_dc.CreateCompatibleDC()
+        self.bitmap = self.win32ui.CreateBitmap()
+        self.bitmap.CreateCompatibleBitmap(self.mfc_dc, width, height)
+        self.save_dc.SelectObject(self.bitmap)
+        self.size = (width, height)
+
+    def release_session(self):
+        if self.bitmap is None:
+            return
+        try:
+            self.win32gui.DeleteObject(self.bitmap.GetHandle())
+            self.save_dc.DeleteDC()
+            self.mfc_dc.DeleteDC()
+            self.win32gui.ReleaseDC(self.hwnd, self.window_dc)
+        except Exception:
+            pass  # The window may already be gone
+        self.window_dc = self.mfc_dc = self.save_dc = self.bitmap = None
+        self.size = None
+
+    def capture(self):
+        hwnd = self.find_window()
+        self.window_found = bool(hwnd)
+        if hwnd:
+            try:
+                left, top, right, bottom = self.win32gui.GetWindowRect(hwnd)
+                width, height = right - left, bottom - top
+                if (width, height) != self.size:
+                    self.release_session()
+                    self.open_session(width, height)
+
+                self.save_dc.BitBlt((0, 0), (width, height), self.mfc_dc, (0, 0), self.win32con.SRCCOPY)
+                bgra = np.frombuffer(self.bitmap.GetBitmapBits(True), dtype=np.uint8).reshape(height, width, 4)
+                return self.bgra_to_bgr(bgra)
+            except Exception as e:
+                print(f"⚠️ Failed to capture Fortnite window: {e}")
+                self.release_session()
+                self.hwnd = None
+
+        return self.fallback.grab()
+
+    def lend(self, frame):
+        super().lend(frame)
+        self.fallback.lend(frame)  # The frame may come from either ring
+
+    def give_back(self, frame):
+        super().give_back(frame)
+        self.fallback.give_back(frame)
+
+    def close(self):
+        self.release_session()
+        self.fallback.close()
+
+    def summary(self):
+        return super().summary() + f" | fallback: {self.fallback.summary()}"
+
+
+class ReplayCapture(CaptureBackend):
+    """
+    Replays a folder of screenshots or a video file as if it were the screen.
+
+    Images are decoded once up front so grabs cost what a real capture's
+    copy would; videos are decoded frame by frame into the reused buffers.
+    Useful for benchmarking the capture → analyze path without a display.
+    """
+
+    name = 'replay'
+
+    def __init__(self, source, loop=True, buffer_count=4):
+        super().__init__(buffer_count)
+        self.source = source
+        self.loop = loop
+        self.images = []
+        self.position = 0
+        self.video = None
+
+        if os.path.isdir(source):
+            for path in sorted(glob.glob(os.path.join(source, '*'))):
+                if path.lower().endswith(IMAGE_EXTENSIONS):
+                    image = cv2.imread(path)
+                    if image is not None:
+                        self.images.append(image)
+            if not self.images:
+                raise ValueError(f"No images to replay in {source}")
+        else:
+            self.video = cv2.VideoCapture(source)
+            if not self.video.isOpened():
+                raise ValueError(f"Could not open video {source}")
+            self.frame_size = (int(self.video.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                               int(self.video.get(cv2.CAP_PROP_FRAME_WIDTH)))
+
+    def capture(self):
+        if self.images:
+            if self.position >= len(self.images):
+                if not self.loop:
+                    return None
+                self.position = 0
+            image = self.images[self.position]
+            self.position += 1
+            frame = self.frame_buffer(*image.shape[:2])
+            np.copyto(frame, image)
+            return frame
+
+        ok, frame = self.video.read(self.frame_buffer(*self.frame_size))
+        if not ok and self.loop:
+            self.video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.video.read(self.frame_buffer(*self.frame_size))
+        return frame if ok else None
+
+    def close(self):
+        if self.video is not None:
+            self.video.release()
+
+
+def _has_module(name):
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+def create_capture_backend(name=None, source=None, buffer_count=4):
+    """
+    Build a capture backend by name: 'win32', 'mss', 'pyautogui' or 'replay'.
+
+    With no name, Windows captures the Fortnite window and everything else
+    captures the primary monitor with mss.
+    """
+    if name is None:
+        name = 'win32' if sys.platform == 'win32' else 'mss'
+    if name == 'win32':
+        return Win32WindowCapture(buffer_count=buffer_count)
+    if name == 'mss':
+        return MSSCapture(buffer_count=buffer_count)
+    if name == 'pyautogui':
+        return PyAutoGUICapture(buffer_count=buffer_count)
+    if name == 'replay':
+        if not source:
+            raise ValueError("Replay capture needs a folder of screenshots or a video file")
+        return ReplayCapture(source, buffer_count=buffer_count)
+    raise ValueError(f"Unknown capture backend: {name}")
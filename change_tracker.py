@@ -0,0 +1,100 @@
+import threading
+
+import cv2
+import numpy as np
+
+from frame_analysis import banner_zone_bottom
+
+
+class TileChangeTracker:
+    """
+    Thumbnail-scale, tile-by-tile change detection against the last analyzed frame.
+
+    Each frame is shrunk to a small grayscale thumbnail and split into a grid
+    of tiles. A tile is dirty when its mean absolute difference from the
+    reference thumbnail is above threshold. Only tiles that overlap the banner
+    zone (the rows where a Victory Royale banner can appear) decide whether
+    the frame needs a fresh banner analysis. The reference only moves when a
+    frame is actually analyzed (mark_analyzed), so a banner that fades or
+    slides in slowly still adds up to a change.
+    """
+
+    def __init__(self, thumb_width=160, tile_size=10, threshold=3.0):
+        self.thumb_width = thumb_width
+        self.tile_size = tile_size
+        self.threshold = threshold
+        self.reference = None  # Thumbnail of the frame the last verdict came from
+        self.latest = None
+        self.zone_rows = {}  # frame (height, width) -> tile rows covering the banner zone
+
+        self.frames_checked = 0
+        self.frames_skipped = 0
+        self.tiles_checked = 0
+        self.tiles_skipped = 0
+        self.lock = threading.Lock()
+
+    def thumbnail(self, frame):
+        height, width = frame.shape[:2]
+        thumb_height = max(self.tile_size, round(height * self.thumb_width / width))
+        # Every pixel through INTER_AREA is the slow part at 4K/5K, so take a
+        # strided view first (keeping ~4 source pixels per thumbnail pixel)
+        step = max(1, width // (self.thumb_width * 4))
+        small = cv2.resize(frame[::step, ::step], (self.thumb_width, thumb_height), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+    def banner_zone_tile_rows(self, frame_shape, thumb_height):
+        """Number of tile rows that overlap the banner zone, cached per capture size"""
+        key = frame_shape[:2]
+        if key not in self.zone_rows:
+            height, width = key
+            zone_fraction = banner_zone_bottom(height, width) / height
+            zone_thumb_rows = zone_fraction * thumb_height
+            self.zone_rows[key] = int(np.ceil(zone_thumb_rows / self.tile_size))
+        return self.zone_rows[key]
+
+    def dirty_tiles(self, previous, current):
+        """Boolean grid of tiles whose mean absolute difference is above threshold"""
+        rows = current.shape[0] // self.tile_size
+        cols = current.shape[1] // self.tile_size
+        height, width = rows * self.tile_size, cols * self.tile_size
+        diff = cv2.absdiff(current[:height, :width], previous[:height, :width])
+        tile_means = diff.reshape(rows, self.tile_size, cols, self.tile_size).mean(axis=(1, 3))
+        return tile_means > self.threshold
+
+    def banner_zone_changed(self, frame):
+        """
+        Compare a frame to the last analyzed one.
+
+        Returns True if any banner-zone tile changed (or there is nothing to
+        compare against yet), False if the banner zone is unchanged. Call
+        mark_analyzed() if the frame then gets a fresh analysis.
+        """
+        thumb = self.thumbnail(frame)
+        with self.lock:
+            reference = self.reference
+            self.latest = thumb
+            self.frames_checked += 1
+
+            if reference is None or reference.shape != thumb.shape:
+                return True
+
+            dirty = self.dirty_tiles(reference, thumb)
+            zone = dirty[:self.banner_zone_tile_rows(frame.shape, thumb.shape[0])]
+            self.tiles_checked += zone.size
+            self.tiles_skipped += int(zone.size - np.count_nonzero(zone))
+
+            if zone.any():
+                return True
+            self.frames_skipped += 1
+            return False
+
+    def mark_analyzed(self):
+        """Make the frame last passed to banner_zone_changed() the reference for later frames"""
+        with self.lock:
+            self.reference = self.latest
+
+    def summary(self):
+        frame_rate = self.frames_skipped / self.frames_checked if self.frames_checked else 0.0
+        tile_rate = self.tiles_skipped / self.tiles_checked if self.tiles_checked else 0.0
+        return (f"Change tracker: {self.frames_skipped}/{self.frames_checked} frames skipped ({frame_rate:.0%}), "
+                f"{self.tiles_skipped}/{self.tiles_checked} banner-zone tiles unchanged ({tile_rate:.0%})")
@@ -0,0 +1,216 @@
+import queue
+import threading
+import time
+
+from sampling_scheduler import AdaptiveScheduler
+
+
+class StageStats:
+    """Frame counts and busy time for one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.processed = 0
+        self.dropped = 0
+        self.busy_time = 0.0
+        self.started_at = time.time()
+        self.lock = threading.Lock()
+
+    def record(self, elapsed):
+        with self.lock:
+            self.processed += 1
+            self.busy_time += elapsed
+
+    def record_drop(self):
+        with self.lock:
+            self.dropped += 1
+
+    @property
+    def throughput(self):
+        """Items handled per second of wall-clock time since the stage started"""
+        elapsed = time.time() - self.started_at
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def average_ms(self):
+        return (self.busy_time / self.processed) * 1000 if self.processed else 0.0
+
+    def summary(self):
+        return (f"{self.name}: {self.processed} done, {self.dropped} dropped, "
+                f"{self.throughput:.2f}/s, avg {self.average_ms:.1f} ms")
+
+
+class DetectionPipeline:
+    """
+    Capture -> analyze -> act engine for VictoryDetector.
+
+    Each stage runs on its own thread and hands work to the next through a
+    bounded queue. Capture runs at the cadence chosen by the scheduler no
+    matter how long analysis or OCR takes; when the analysis queue is full the oldest frame is dropped,
+    so analysis always works on the freshest screen instead of building up
+    latency. Victory handling (saving, post generation, LinkedIn) runs on the
+    action thread so it never holds up capture. Queued frames are lent from
+    the capture ring and given back once analyzed or dropped, so capture
+    never overwrites a frame that analysis still reads.
+    """
+
+    def __init__(self, detector, scheduler=None, frame_queue_size=2, stats_interval=60, metrics_json=None):
+        self.detector = detector
+        self.scheduler = scheduler or AdaptiveScheduler()
+        self.stats_interval = stats_interval
+        self.metrics_json = metrics_json
+
+        self.frame_queue = queue.Queue(maxsize=frame_queue_size)
+        self.victory_queue = queue.Queue(maxsize=4)
+        self.stop_event = threading.Event()
+
+        self.stats = {
+            'capture': StageStats('capture'),
+            'analyze': StageStats('analyze'),
+            'act': StageStats('act'),
+        }
+        self.threads = []
+
+        metrics = detector.metrics
+        metrics.add_gauge('victory_detector_frame_queue_depth', "Frames waiting for analysis",
+                          self.frame_queue.qsize)
+        metrics.add_gauge('victory_detector_victory_queue_depth', "Victories waiting to be handled",
+                          self.victory_queue.qsize)
+        metrics.add_gauge('victory_detector_capture_interval_seconds', "Interval the scheduler last chose",
+                          lambda: self.scheduler.history[-1][1] if self.scheduler.history else 0.0)
+
+    def put_latest(self, item):
+        """Queue a frame, discarding the oldest waiting frame if analysis is behind"""
+        while True:
+            try:
+                self.frame_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    _, dropped = self.frame_queue.get_nowait()
+                    self.detector.capture.give_back(dropped)
+                    self.stats['analyze'].record_drop()
+                except queue.Empty:
+                    pass
+
+    def capture_loop(self):
+        stats = self.stats['capture']
+        while not self.stop_event.is_set():
+            start = time.time()
+            cpu_start = time.thread_time()
+            try:
+                screen = self.detector.take_screenshot()
+            except Exception as e:
+                print(f"⚠️ Capture error: {e}")
+                screen = None
+            elapsed = time.time() - start
+            self.scheduler.record_capture(time.thread_time() - cpu_start, self.detector.window_found)
+
+            if screen is not None:
+                stats.record(elapsed)
+                self.detector.metrics.observe('capture', elapsed)
+                if self.detector.clip_recorder:
+                    with self.detector.metrics.time('clip'):
+                        self.detector.clip_recorder.push(screen, start)
+                self.detector.capture.lend(screen)
+                self.put_latest((start, screen))
+
+            # Sleep only for what is left of the interval to keep a steady cadence
+            self.stop_event.wait(max(0.0, self.scheduler.next_interval() - elapsed))
+
+    def analyze_loop(self):
+        stats = self.stats['analyze']
+        while not self.stop_event.is_set():
+            try:
+                capture_time, screen = self.frame_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            start = time.time()
+            cpu_start = time.thread_time()
+            try:
+                # Runs under the profiler while a profiling request is pending
+                victory = self.detector.profiler.run(self.detector.analyze_frame, screen, capture_time)
+            except Exception as e:
+                # One bad frame (or OCR failing to load) must not stop detection
+                print(f"❌ Frame analysis error: {e}")
+                victory = None
+            finally:
+                # A victory frame was copied by analyze_frame, so capture may reuse this one
+                self.detector.capture.give_back(screen)
+            stats.record(time.time() - start)
+            self.detector.metrics.observe('analyze', time.time() - start)
+            self.scheduler.record_analysis(time.thread_time() - cpu_start, self.detector.last_frame_candidate)
+
+            if victory is not None:
+                self.victory_queue.put(victory)
+
+    def act_loop(self):
+        stats = self.stats['act']
+        while not self.stop_event.is_set():
+            try:
+                victory = self.victory_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            start = time.time()
+            try:
+                self.detector.act_on_victory(*victory)
+            except Exception as e:
+                print(f"❌ Victory handling error: {e}")
+            stats.record(time.time() - start)
+
+    def report(self):
+        print("📈 Pipeline stats:")
+        for stage in self.stats.values():
+            print(f"   {stage.summary()}")
+        print(f"   queued frames: {self.frame_queue.qsize()}, queued victories: {self.victory_queue.qsize()}")
+        print(f"   {self.scheduler.summary()}")
+        if self.detector.capture:
+            print(f"   {self.detector.capture.summary()}")
+        print(f"   {self.detector.change_tracker.summary()}")
+        print(f"   {self.detector.ocr_cache.summary()}")
+        print(f"   {self.detector.template_verifier.summary()}")
+        print(f"   {self.detector.screenshot_writer.summary()}")
+        print(f"   {self.detector.job_workers.summary()}")
+        if self.detector.post_pool:
+            print(f"   {self.detector.post_pool.summary()}")
+        if self.detector.clip_recorder:
+            print(f"   {self.detector.clip_recorder.summary()}")
+        print(f"   {self.detector.metrics.stage_summary()}")
+        if self.metrics_json:
+            try:
+                self.detector.metrics.dump_json(self.metrics_json)
+            except OSError as e:
+                print(f"⚠️ Could not write metrics to {self.metrics_json}: {e}")
+
+    def start(self):
+        self.stop_event.clear()
+        for stage in self.stats.values():
+            stage.started_at = time.time()
+        for name, target in [('capture', self.capture_loop),
+                             ('analyze', self.analyze_loop),
+                             ('act', self.act_loop)]:
+            thread = threading.Thread(target=target, name=f"pipeline-{name}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, timeout=5):
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join(timeout=timeout)
+        self.threads = []
+
+    def run(self):
+        """Run until Ctrl+C, printing stage stats every stats_interval seconds"""
+        self.start()
+        try:
+            last_report = time.time()
+            while not self.stop_event.is_set():
+                time.sleep(0.5)
+                if self.stats_interval and time.time() - last_report >= self.stats_interval:
+                    self.report()
+                    last_report = time.time()
+        finally:
+            self.stop()
+            self.report()
@@ -0,0 +1,68 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from ocr_cache import hamming_distance
+
+
+def frame_fingerprint(image, bits=256):
+    """
+    Perceptual fingerprint of a whole frame as a bits-wide integer.
+
+    Same difference hash as roi_hash, on a larger grid: 64 bits (9x8) or
+    256 bits (17x16). The frame is strided before INTER_AREA so a 4K capture
+    costs about as much as a 1080p one.
+    """
+    side = int(np.sqrt(bits))
+    width = image.shape[1]
+    step = max(1, width // (side * 32))
+    small = cv2.resize(image[::step, ::step], (side + 1, side), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+    diff = gray[:, 1:] > gray[:, :-1]
+    return int.from_bytes(np.packbits(diff).tobytes(), 'big')
+
+
+def fingerprint_hex(fingerprint, bits=256):
+    """Fixed-width hex form used in the victory history database"""
+    return format(fingerprint, f'0{bits // 4}x')
+
+
+class FingerprintStore:
+    """
+    Fingerprints of recently handled victories, for duplicate checks.
+
+    The fingerprints themselves are saved with each win in the victory
+    history database; this keeps the ones from the last duplicate_window
+    seconds in memory, so a restart still knows which wins were already
+    posted. A new detection is a duplicate if its fingerprint is within
+    duplicate_distance bits of one of them.
+    """
+
+    def __init__(self, history, bits=256, duplicate_distance=16, duplicate_window=6 * 3600):
+        self.bits = bits
+        self.duplicate_distance = duplicate_distance
+        self.duplicate_window = duplicate_window
+        self.lock = threading.Lock()
+
+        # (timestamp, fingerprint, screenshot), oldest first
+        self.entries = [(detected_at, int(fingerprint, 16), screenshot)
+                        for detected_at, fingerprint, screenshot
+                        in history.fingerprints_since(time.time() - duplicate_window)]
+
+    def add(self, fingerprint, screenshot=None, timestamp=None):
+        with self.lock:
+            self.entries.append((time.time() if timestamp is None else timestamp, fingerprint, screenshot))
+
+    def find_duplicate(self, fingerprint, now=None):
+        """Return the (timestamp, fingerprint, screenshot) entry this victory repeats, or None"""
+        now = time.time() if now is None else now
+        with self.lock:
+            for entry in reversed(self.entries):
+                timestamp, known, _ = entry
+                if now - timestamp > self.duplicate_window:
+                    break
+                if hamming_distance(fingerprint, known) <= self.duplicate_distance:
+                    return entry
+        return None
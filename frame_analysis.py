@@ -0,0 +1,315 @@
+import time
+from contextlib import contextmanager
+from functools import cached_property, lru_cache
+
+import cv2
+import numpy as np
+
+# Strict HSV ranges used by the banner detector (see VictoryDetector.detect_victory_colors)
+BANNER_BLUE_LOWER = np.array([100, 120, 120])
+BANNER_BLUE_UPPER = np.array([120, 255, 255])
+BANNER_ORANGE_LOWER = np.array([12, 120, 120])
+BANNER_ORANGE_UPPER = np.array([22, 255, 255])
+TEXT_WHITE_LOWER = np.array([0, 0, 220])
+TEXT_WHITE_UPPER = np.array([180, 25, 255])
+
+# Closing kernel that merges banner fragments into one wide shape
+BANNER_KERNEL_SIZE = (30, 8)
+
+# Banner acceptance rules: center in the top 40% of the frame and the middle
+# 60% horizontally, between 3:1 and 5.5:1 wide
+BANNER_MAX_CENTER_Y = 0.4
+BANNER_MIN_CENTER_X = 0.2
+BANNER_MAX_CENTER_X = 0.8
+BANNER_MIN_ASPECT = 3.0
+BANNER_MAX_ASPECT = 5.5
+
+# Extra rows kept below the banner zone for the closing kernel and text padding
+BANNER_ZONE_MARGIN = 40
+
+
+@lru_cache(maxsize=16)
+def banner_zone_bottom(height, width):
+    """
+    First row below which no acceptable banner can reach, for a given capture size.
+
+    A banner is at most the frame width wide and more than BANNER_MIN_ASPECT
+    times wider than tall, so its height is below width / BANNER_MIN_ASPECT.
+    With its center in the top BANNER_MAX_CENTER_Y of the frame, its bottom
+    edge stays above height * BANNER_MAX_CENTER_Y + width / (2 * BANNER_MIN_ASPECT).
+    """
+    bottom = int(height * BANNER_MAX_CENTER_Y + width / (2 * BANNER_MIN_ASPECT)) + BANNER_ZONE_MARGIN
+    return min(height, bottom)
+
+
+class FrameAnalysis:
+    """
+    Per-frame cache of the intermediate images used by the detection stages.
+
+    Every product (HSV image, color masks, closed mask, contours) is computed
+    lazily on first access and then reused, so the visual banner check and the
+    OCR stage share one HSV conversion and one set of masks per frame.
+
+    With working_width set (cascade mode), the masks are built on a frame
+    downscaled to that width. Pixel thresholds must then go through scaled()
+    and scaled_area(), and boxes are mapped back with to_full_resolution()
+    before cropping the original image for OCR.
+
+    With crop_to_banner_zone, rows below banner_zone_bottom() are dropped
+    before any conversion. The crop is anchored at the top-left corner, so
+    mask coordinates still match frame coordinates.
+    """
+
+    def __init__(self, image, working_width=None, crop_to_banner_zone=False):
+        self.image = image
+        self.scale = 1.0
+        self._banner_rects = {}
+        self.timings = {}  # stage -> seconds spent on this frame (see timed)
+
+        full_height, full_width = image.shape[:2]
+        if working_width and full_width > working_width:
+            self.scale = working_width / full_width
+
+        # Height and width of the whole frame at working resolution
+        self.frame_shape = (max(1, round(full_height * self.scale)), max(1, round(full_width * self.scale)))
+
+        source = image
+        self.cropped = False
+        if crop_to_banner_zone:
+            zone_bottom = banner_zone_bottom(full_height, full_width)
+            if zone_bottom < full_height:
+                source = image[:zone_bottom]
+                self.cropped = True
+
+        if self.scale == 1.0:
+            self.work_image = source
+        else:
+            working_height = max(1, round(source.shape[0] * self.scale))
+            with self.timed('color'):
+                self.work_image = cv2.resize(source, (self.frame_shape[1], working_height), interpolation=cv2.INTER_AREA)
+
+    @property
+    def shape(self):
+        """Height and width of the whole frame at working resolution (for position rules)"""
+        return self.frame_shape
+
+    @property
+    def mask_shape(self):
+        """Height and width of the masks, which is smaller than shape when cropped"""
+        return self.work_image.shape[:2]
+
+    @contextmanager
+    def timed(self, stage):
+        """Add the time spent in the block to this frame's total for stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = self.timings.get(stage, 0.0) + time.perf_counter() - start
+
+    def scaled(self, pixels):
+        """Convert a full-resolution length to working resolution"""
+        return pixels * self.scale
+
+    def scaled_area(self, area):
+        """Convert a full-resolution area to working resolution"""
+        return area * self.scale * self.scale
+
+    def to_full_resolution(self, rect):
+        """Map an (x, y, w, h) box from working resolution back to the original frame"""
+        if self.scale == 1.0:
+            return rect
+        x, y, w, h = rect
+        full_height, full_width = self.image.shape[:2]
+        x1 = max(0, int(x / self.scale))
+        y1 = max(0, int(y / self.scale))
+        x2 = min(full_width, int(np.ceil((x + w) / self.scale)))
+        y2 = min(full_height, int(np.ceil((y + h) / self.scale)))
+        return x1, y1, x2 - x1, y2 - y1
+
+    @cached_property
+    def hsv(self):
+        with self.timed('color'):
+            return cv2.cvtColor(self.work_image, cv2.COLOR_BGR2HSV)
+
+    @cached_property
+    def blue_mask(self):
+        hsv = self.hsv
+        with self.timed('color'):
+            return cv2.inRange(hsv, BANNER_BLUE_LOWER, BANNER_BLUE_UPPER)
+
+    @cached_property
+    def orange_mask(self):
+        hsv = self.hsv
+        with self.timed('color'):
+            return cv2.inRange(hsv, BANNER_ORANGE_LOWER, BANNER_ORANGE_UPPER)
+
+    @cached_property
+    def white_mask(self):
+        hsv = self.hsv
+        with self.timed('text'):
+            return cv2.inRange(hsv, TEXT_WHITE_LOWER, TEXT_WHITE_UPPER)
+
+    @cached_property
+    def white_integral(self):
+        """
+        Summed-area table of the white mask, in units of 255 (one white pixel).
+
+        Entry [y, x] is 255 times the number of white pixels above and left of
+        (x, y). Summing the 0/255 mask directly avoids a thresholding pass;
+        32-bit sums are used whenever they can't overflow.
+        """
+        white_mask = self.white_mask
+        sdepth = cv2.CV_32S if white_mask.size * 255 < 2 ** 31 else cv2.CV_64F
+        with self.timed('text'):
+            return cv2.integral(white_mask, sdepth=sdepth)
+
+    def white_box(self, x1, y1, x2, y2):
+        """Clip a box to the mask (it may extend below a banner-zone crop)"""
+        mask_height, mask_width = self.mask_shape
+        return max(0, x1), max(0, y1), min(x2, mask_width), min(y2, mask_height)
+
+    def white_pixels(self, x1, y1, x2, y2):
+        """Number of white-text pixels in [y1:y2, x1:x2], in O(1) from the integral image"""
+        x1, y1, x2, y2 = self.white_box(x1, y1, x2, y2)
+        if x2 <= x1 or y2 <= y1:
+            return 0
+        table = self.white_integral
+        return int(table[y2, x2] - table[y1, x2] - table[y2, x1] + table[y1, x1]) // 255
+
+    def white_text_span(self, x1, y1, x2, y2):
+        """
+        Widest horizontal run of columns in [y1:y2, x1:x2] that contain white text.
+
+        The column-projection profile of the box comes from two rows of the
+        integral image, so this costs O(width) with no contour tracing.
+        """
+        x1, y1, x2, y2 = self.white_box(x1, y1, x2, y2)
+        if x2 <= x1 or y2 <= y1:
+            return 0
+        table = self.white_integral
+        column_totals = table[y2, x1:x2 + 1] - table[y1, x1:x2 + 1]
+        occupied = np.diff(column_totals) > 0
+
+        edges = np.flatnonzero(np.diff(np.concatenate(([False], occupied, [False])).view(np.int8)))
+        if not len(edges):
+            return 0
+        return int((edges[1::2] - edges[::2]).max())
+
+    @cached_property
+    def color_mask(self):
+        """Blue + orange banner pixels, before morphology"""
+        blue_mask, orange_mask = self.blue_mask, self.orange_mask
+        with self.timed('color'):
+            return cv2.bitwise_or(blue_mask, orange_mask)
+
+    @cached_property
+    def closed_mask(self):
+        """Banner mask after MORPH_CLOSE joins the banner into one shape"""
+        kernel_size = (max(1, round(self.scaled(BANNER_KERNEL_SIZE[0]))),
+                       max(1, round(self.scaled(BANNER_KERNEL_SIZE[1]))))
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, kernel_size)
+        color_mask = self.color_mask
+        with self.timed('morphology'):
+            return cv2.morphologyEx(color_mask, cv2.MORPH_CLOSE, kernel)
+
+    @cached_property
+    def banner_contours(self):
+        """External contours of the closed banner mask (visual stage)"""
+        closed_mask = self.closed_mask
+        with self.timed('contours'):
+            contours, _ = cv2.findContours(closed_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        return contours
+
+    @cached_property
+    def color_contours(self):
+        """External contours of the raw color mask (OCR region proposals)"""
+        color_mask = self.color_mask
+        with self.timed('contours'):
+            contours, _ = cv2.findContours(color_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        return contours
+
+    @cached_property
+    def banner_contour_stats(self):
+        contours = self.banner_contours
+        with self.timed('contours'):
+            return contour_stats(contours)
+
+    @cached_property
+    def color_contour_stats(self):
+        contours = self.color_contours
+        with self.timed('contours'):
+            return contour_stats(contours)
+
+    def banner_rects(self, min_area):
+        """
+        Bounding boxes of closed-mask shapes that pass the banner rules.
+
+        min_area is in working-resolution pixels. Boxes come back in contour
+        order, in working-resolution coordinates, and are memoized per min_area.
+        """
+        if min_area in self._banner_rects:
+            return self._banner_rects[min_area]
+
+        rects, areas = self.banner_contour_stats
+        x, y, w, h = rects.T
+        img_height, img_width = self.shape
+
+        # Every rule is applied to all contours at once: large enough,
+        # banner-shaped (wide rectangle), in the upper 40% of the screen and
+        # reasonably centered
+        aspect_ratio = w / h
+        center_x = x + w / 2
+        center_y = y + h / 2
+        keep = ((areas > min_area) &
+                (aspect_ratio > BANNER_MIN_ASPECT) & (aspect_ratio < BANNER_MAX_ASPECT) &
+                (center_y < img_height * BANNER_MAX_CENTER_Y) &
+                (center_x > img_width * BANNER_MIN_CENTER_X) &
+                (center_x < img_width * BANNER_MAX_CENTER_X))
+        if self.cropped:
+            keep &= y + h < self.work_image.shape[0]
+
+        result = [tuple(int(v) for v in rect) for rect in rects[keep]]
+        self._banner_rects[min_area] = result
+        return result
+
+    def proposal_rects(self, min_area):
+        """
+        Bounding boxes of raw color-mask shapes larger than min_area (working resolution).
+
+        When cropped, only shapes inside the banner zone are proposed: color
+        further down the frame is never read by OCR. Any box that could pass
+        banner_rects() lies inside the zone, so no banner is lost, and a shape
+        cut by the crop edge is proposed only down to that edge.
+        """
+        rects, areas = self.color_contour_stats
+        return [tuple(int(v) for v in rect) for rect in rects[areas > min_area]]
+
+
+def contour_stats(contours):
+    """
+    Bounding boxes and areas of many contours in one vectorized pass.
+
+    Returns an (N, 4) array of x, y, w, h and an (N,) array of areas, equal
+    to cv2.boundingRect and cv2.contourArea of each contour. All points are
+    concatenated once; boxes come from per-contour min/max reductions and
+    areas from the shoelace formula, which is what contourArea computes.
+    """
+    if not contours:
+        return np.empty((0, 4), dtype=np.int64), np.empty(0)
+
+    lengths = np.fromiter(map(len, contours), dtype=np.intp, count=len(contours))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    points = np.concatenate(contours).reshape(-1, 2).astype(np.int64)
+    xs, ys = points[:, 0], points[:, 1]
+
+    x_min, y_min = np.minimum.reduceat(xs, starts), np.minimum.reduceat(ys, starts)
+    x_max, y_max = np.maximum.reduceat(xs, starts), np.maximum.reduceat(ys, starts)
+    rects = np.stack([x_min, y_min, x_max - x_min + 1, y_max - y_min + 1], axis=1)
+
+    # Each point's successor along its own (closed) contour
+    successor = np.arange(1, len(points) + 1)
+    successor[starts + lengths - 1] = starts
+    cross = xs * ys[successor] - xs[successor] * ys
+    areas = np.abs(np.add.reduceat(cross, starts)) / 2.0
+    return rects, areas
@@ -0,0 +1,218 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after REAL NOT NULL,
+    locked_by TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, run_after);
+"""
+
+
+class JobQueue:
+    """
+    Durable work queue in SQLite.
+
+    Jobs survive restarts: anything queued, waiting for a retry or cut off
+    mid-run is picked up again the next time workers start. Every job has an
+    idempotency key, and enqueueing an existing key returns the existing job
+    instead of adding a second one. Failed jobs are retried with exponential
+    backoff (retry_delay, 2x, 4x, ...) until max_attempts, then marked failed.
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, path=os.path.join("victory_screenshots", "jobs.db"), retry_delay=30.0):
+        self.path = path
+        self.retry_delay = retry_delay
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        # Shared by the worker threads, serialized by the lock
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(SCHEMA)
+
+    def enqueue(self, kind, idempotency_key, payload, max_attempts=3):
+        """Add a job unless one with this key exists; returns the job id either way"""
+        now = time.time()
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO jobs (kind, idempotency_key, payload, max_attempts, run_after, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, idempotency_key, json.dumps(payload), max_attempts, now, now)
+            )
+            return self.connection.execute(
+                "SELECT id FROM jobs WHERE idempotency_key = ?", (idempotency_key,)
+            ).fetchone()[0]
+
+    def claim(self, worker_name):
+        """Mark the oldest ready job as running for this worker and return it, or None"""
+        with self.lock:
+            # BEGIN IMMEDIATE takes the write lock up front, so a second process
+            # sharing the file can't claim the same job between SELECT and UPDATE
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.connection.execute(
+                    "SELECT * FROM jobs WHERE status = ? AND run_after <= ? ORDER BY run_after LIMIT 1",
+                    (self.QUEUED, time.time())
+                ).fetchone()
+                if row is not None:
+                    self.connection.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, locked_by = ? WHERE id = ?",
+                        (self.RUNNING, worker_name, row['id'])
+                    )
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        job = dict(row)
+        job['attempts'] += 1
+        job['payload'] = json.loads(job['payload'])
+        return job
+
+    def complete(self, job_id):
+        with self.lock:
+            self.connection.execute(
+                "UPDATE jobs SET status = ?, locked_by = NULL, last_error = NULL, finished_at = ? WHERE id = ?",
+                (self.DONE, time.time(), job_id)
+            )
+
+    def fail(self, job_id, error):
+        """Schedule a retry with backoff, or mark the job failed once it is out of attempts; returns the delay or None"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row['attempts'] >= row['max_attempts']:
+                self.connection.execute(
+                    "UPDATE jobs SET status = ?, locked_by = NULL, last_error = ?, finished_at = ? WHERE id = ?",
+                    (self.FAILED, str(error), time.time(), job_id)
+                )
+                return None
+            delay = self.retry_delay * 2 ** (row['attempts'] - 1)
+            self.connection.execute(
+                "UPDATE jobs SET status = ?, locked_by = NULL, last_error = ?, run_after = ? WHERE id = ?",
+                (self.QUEUED, str(error), time.time() + delay, job_id)
+            )
+            return delay
+
+    def update_payload(self, job_id, payload):
+        """Save progress (e.g. details the user already typed) so a retry doesn't redo it"""
+        with self.lock:
+            self.connection.execute("UPDATE jobs SET payload = ? WHERE id = ?", (json.dumps(payload), job_id))
+
+    def requeue_interrupted(self):
+        """Jobs left running by a previous run that stopped mid-job go back in the queue"""
+        with self.lock:
+            return self.connection.execute(
+                "UPDATE jobs SET status = ?, locked_by = NULL WHERE status = ?", (self.QUEUED, self.RUNNING)
+            ).rowcount
+
+    def counts(self):
+        with self.lock:
+            rows = self.connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class JobWorkers:
+    """
+    Worker threads that run jobs from a JobQueue.
+
+    handlers maps a job kind to a function taking (payload, job); an exception
+    from the handler counts as a failed attempt. Idle workers poll every
+    poll_interval seconds, and wake() starts them immediately on new work.
+    """
+
+    def __init__(self, job_queue, handlers, workers=2, poll_interval=1.0):
+        self.job_queue = job_queue
+        self.handlers = handlers
+        self.worker_count = workers
+        self.poll_interval = poll_interval
+        self.stop_event = threading.Event()
+        self.wake_event = threading.Event()
+        self.threads = []
+
+        self.jobs_done = 0
+        self.jobs_retried = 0
+        self.jobs_failed = 0
+        self.stats_lock = threading.Lock()
+
+    def start(self):
+        interrupted = self.job_queue.requeue_interrupted()
+        if interrupted:
+            print(f"🗂️ Resuming {interrupted} job(s) interrupted last time")
+        self.stop_event.clear()
+        for index in range(self.worker_count):
+            thread = threading.Thread(target=self.run, args=(f"worker-{index + 1}",),
+                                      name=f"job-worker-{index + 1}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def wake(self):
+        self.wake_event.set()
+
+    def run(self, worker_name):
+        while not self.stop_event.is_set():
+            job = self.job_queue.claim(worker_name)
+            if job is None:
+                self.wake_event.wait(self.poll_interval)
+                self.wake_event.clear()
+                continue
+
+            try:
+                self.handlers[job['kind']](job['payload'], job)
+                self.job_queue.complete(job['id'])
+                with self.stats_lock:
+                    self.jobs_done += 1
+            except Exception as e:
+                delay = self.job_queue.fail(job['id'], e)
+                with self.stats_lock:
+                    if delay is None:
+                        self.jobs_failed += 1
+                    else:
+                        self.jobs_retried += 1
+                if delay is None:
+                    print(f"❌ Job {job['id']} ({job['kind']}) failed after {job['attempts']} attempt(s): {e}")
+                else:
+                    print(f"🔁 Job {job['id']} ({job['kind']}) failed: {e} - retrying in {delay:.0f}s")
+
+    def stop(self, timeout=5.0):
+        """Stop taking new jobs; jobs still running after timeout are resumed on the next start"""
+        self.stop_event.set()
+        self.wake_event.set()
+        deadline = time.time() + timeout
+        for thread in self.threads:
+            thread.join(max(0.0, deadline - time.time()))
+        self.threads = [thread for thread in self.threads if thread.is_alive()]
+
+    def summary(self):
+        counts = self.job_queue.counts()
+        return (f"Jobs: {self.jobs_done} done, {self.jobs_retried} retried, {self.jobs_failed} failed this session | "
+                f"queued {counts.get(JobQueue.QUEUED, 0)}, running {counts.get(JobQueue.RUNNING, 0)}")
@@ -86,7 +86,8 @@ class LinkedInPoster:
         Post to LinkedIn with text and optional image
         
         Args:
-            text_content: The post text
+            text_content: The post text, or a stream of chunks (e.g. a PostStream) that is
+                shown in the composer as it arrives
             image_path: Path to image to upload (optional)
             full_auto: If True, clicks Post button. If False, leaves it for user to click.
         """
@@ -175,6 +176,10 @@ class LinkedInPoster:
             text_editor.click()
             time.sleep(0.5)
             
+            # A post still being generated fills the composer as it's written
+            if not isinstance(text_content, str):
+                text_content = self.stream_into_editor(text_editor, text_content)
+            
             # Split the text to handle the hyperlink separately
             # Check if text has the signature with placeholder for link
             if "Fortnite LinkedIn Auto-Poster" in text_content and "https://www.youtube.com/watch?v=dQw4w9WgXcQ" in text_content:
@@ -356,6 +361,19 @@ class LinkedInPoster:
             input("   Press Enter to close browser...")
             return False
     
+    def stream_into_editor(self, text_editor, chunks, refresh_interval=0.2):
+        """Show text in the composer while it streams in; returns the full text"""
+        text = ""
+        last_refresh = 0.0
+        for chunk in chunks:
+            text += chunk
+            # Rewriting the editor on every token would just queue up browser round trips
+            if time.time() - last_refresh >= refresh_interval:
+                self.driver.execute_script("arguments[0].innerText = arguments[1];", text_editor, text)
+                last_refresh = time.time()
+        print("✅ Post finished streaming into the composer")
+        return text
+    
     def close(self):
         """Close the browser"""
         if self.driver:
@@ -400,13 +418,13 @@ def test_linkedin_connection():
         # Test opening the post composer with dummy content
         test_post = "This is a test post from the Victory Royale Auto-Poster! 🎮\n\nTesting 1, 2, 3..."
         
-        # Look for a victory screenshot to test with
-        test_image = None
-        if os.path.exists("victory_screenshots"):
-            screenshots = [f for f in os.listdir("victory_screenshots") if f.endswith('.png')]
-            if screenshots:
-                test_image = os.path.join("victory_screenshots", screenshots[0])
-                print(f"   Using test image: {test_image}")
+        # Use the most recent victory screenshot to test with
+        from victory_history import VictoryHistory
+        history = VictoryHistory()
+        test_image = history.latest_image_path()
+        history.close()
+        if test_image:
+            print(f"   Using test image: {test_image}")
         
         try:
             success = poster.post_to_linkedin(test_post, image_path=test_image, full_auto=False)
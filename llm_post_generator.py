@@ -1,16 +1,86 @@
 import openai
 import os
+import sys
 import json
+import time
+import asyncio
+import threading
 from datetime import datetime
 
+class PostStream:
+    """
+    A post being generated on a background thread, chunk by chunk.
+    
+    Iterating yields the chunks as they arrive, always from the beginning,
+    so the console preview and the LinkedIn composer can follow the same
+    stream. text() waits for the whole post (None if generation failed).
+    first_content_seconds is how long the first visible text took.
+    """
+    
+    def __init__(self, chunks):
+        self.parts = []
+        self.done = False
+        self.error = None
+        self.started_at = time.perf_counter()
+        self.first_content_seconds = None
+        self.total_seconds = None
+        self.condition = threading.Condition()
+        threading.Thread(target=self.run, args=(chunks,), name="post-stream", daemon=True).start()
+    
+    def run(self, chunks):
+        try:
+            for chunk in chunks:
+                with self.condition:
+                    if self.first_content_seconds is None and chunk.strip():
+                        self.first_content_seconds = time.perf_counter() - self.started_at
+                    self.parts.append(chunk)
+                    self.condition.notify_all()
+        except Exception as e:
+            self.error = e
+            print(f"❌ Error generating post: {e}")
+        finally:
+            with self.condition:
+                self.done = True
+                self.total_seconds = time.perf_counter() - self.started_at
+                self.condition.notify_all()
+    
+    def __iter__(self):
+        index = 0
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: index < len(self.parts) or self.done)
+                new_parts = self.parts[index:]
+                finished = self.done
+            index += len(new_parts)
+            yield from new_parts
+            if finished:
+                if self.error:
+                    raise RuntimeError(f"Post generation failed: {self.error}")
+                return
+    
+    def text(self, timeout=None):
+        with self.condition:
+            self.condition.wait_for(lambda: self.done, timeout)
+        if self.error or not self.done:
+            return None
+        return "".join(self.parts)
+
+
 class LinkedInPostGenerator:
-    def __init__(self, api_key=None):
-        """Initialize OpenAI API client"""
+    def __init__(self, api_key=None, base_url=None, model="gpt-4o-mini"):
+        """
+        Initialize OpenAI API client
+        
+        base_url points at any OpenAI-compatible server (OPENAI_BASE_URL works
+        too), e.g. a local stub for testing.
+        """
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("Please set OPENAI_API_KEY environment variable or pass api_key")
         
-        openai.api_key = self.api_key
+        self.base_url = base_url or os.environ.get("OPENAI_BASE_URL")
+        self.model = model  # gpt-4o-mini: super cheap and perfect for this!
+        self.client = openai.OpenAI(api_key=self.api_key, base_url=self.base_url)
         
         # Personality mode prompts
         self.personalities = {
@@ -94,6 +164,37 @@ Keep it to 3-4 paragraphs with a winking tone throughout."""
             Generated LinkedIn post text
         """
         
+        try:
+            # Call OpenAI API (ChatGPT)
+            response = self.client.chat.completions.create(
+                **self.request_options(personality, extra_details)
+            )
+            return self.add_signature(response.choices[0].message.content)
+            
+        except Exception as e:
+            print(f"❌ Error generating post: {e}")
+            return None
+    
+    def stream_post(self, personality="business_bro", extra_details=None):
+        """
+        Start generating a post and return a PostStream right away.
+        
+        Tokens are streamed as the model writes them; the signature is added
+        as the last chunk once the model is done.
+        """
+        def chunks():
+            response = self.client.chat.completions.create(
+                stream=True, **self.request_options(personality, extra_details)
+            )
+            for event in response:
+                if event.choices and event.choices[0].delta.content:
+                    yield event.choices[0].delta.content
+            yield self.add_signature("")
+        
+        return PostStream(chunks())
+    
+    def build_messages(self, personality, extra_details=None):
+        """System + user prompt for one personality"""
         if personality not in self.personalities:
             personality = "business_bro"
         
@@ -114,30 +215,74 @@ Keep it to 3-4 paragraphs with a winking tone throughout."""
                 details_text += f"- Final placement: #{extra_details['placement']}\n"
             user_prompt += details_text
         
-        try:
-            # Call OpenAI API (ChatGPT)
-            response = openai.chat.completions.create(
-                model="gpt-4o-mini",  # Super cheap and perfect for this!
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=800,
-                temperature=0.9  # Higher temperature for more creative/funny posts
-            )
-            
-            post_text = response.choices[0].message.content
-            
-            # Add signature with hyperlink
-            # Note: LinkedIn uses plain URLs in text, the link will auto-format
-            post_text += "\n\n---\nquality content brought to you by the Fortnite LinkedIn Auto-Poster"
-            post_text += "\nhttps://github.com/bwu32/fortnitelinkedinautoposter"
-            
-            return post_text
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+    
+    def request_options(self, personality, extra_details=None):
+        """Chat completion arguments shared by the blocking and async paths"""
+        return {
+            'model': self.model,
+            'messages': self.build_messages(personality, extra_details),
+            'max_tokens': 800,
+            'temperature': 0.9  # Higher temperature for more creative/funny posts
+        }
+    
+    def add_signature(self, post_text):
+        # Add signature with hyperlink
+        # Note: LinkedIn uses plain URLs in text, the link will auto-format
+        post_text += "\n\n---\nquality content brought to you by the Fortnite LinkedIn Auto-Poster"
+        post_text += "\nhttps://github.com/bwu32/fortnitelinkedinautoposter"
+        return post_text
+    
+    async def generate_drafts_async(self, personalities=None, candidates=1, extra_details=None,
+                                    max_concurrency=6, timeout=30.0):
+        """
+        Generate several drafts at once and yield them as they finish.
+        
+        One request per personality (all of them by default) times
+        `candidates`, at most max_concurrency in flight. Yields
+        (personality, post_text) in completion order; post_text is None when
+        a request failed or took longer than `timeout` seconds.
+        """
+        requests = [personality for personality in (personalities or list(self.personalities))
+                    for _ in range(candidates)]
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async with openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url,
+                                      timeout=timeout, max_retries=0) as client:
+            async def draft(personality):
+                async with semaphore:
+                    try:
+                        response = await asyncio.wait_for(
+                            client.chat.completions.create(**self.request_options(personality, extra_details)),
+                            timeout
+                        )
+                        return personality, self.add_signature(response.choices[0].message.content)
+                    except asyncio.TimeoutError:
+                        print(f"⏱️ {personality} draft timed out after {timeout:.0f}s")
+                    except Exception as e:
+                        print(f"❌ Error generating {personality} draft: {e}")
+                    return personality, None
             
-        except Exception as e:
-            print(f"❌ Error generating post: {e}")
-            return None
+            tasks = [asyncio.ensure_future(draft(personality)) for personality in requests]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                # The caller may stop early (e.g. after the first good draft)
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def generate_drafts(self, personalities=None, candidates=1, extra_details=None,
+                        max_concurrency=6, timeout=30.0):
+        """Blocking wrapper around generate_drafts_async: [(personality, post_text)] in completion order"""
+        async def collect():
+            return [draft async for draft in self.generate_drafts_async(
+                personalities, candidates, extra_details, max_concurrency, timeout)]
+        return asyncio.run(collect())
     
     def list_personalities(self):
         """List all available personality modes"""
@@ -179,5 +324,23 @@ def test_generator():
     else:
         print("❌ Failed to generate post")
 
+def compare_personalities(candidates=1):
+    """Generate a draft for every personality at once and print each as it arrives"""
+    generator = LinkedInPostGenerator()
+    
+    async def show_drafts():
+        start = time.perf_counter()
+        async for personality, post in generator.generate_drafts_async(candidates=candidates):
+            print("="*60)
+            print(f"{generator.personalities[personality]['name']} ({time.perf_counter() - start:.1f}s)")
+            print("="*60)
+            print(post or "❌ No draft")
+        print(f"\n⏱️ All drafts in {time.perf_counter() - start:.1f}s")
+    
+    asyncio.run(show_drafts())
+
 if __name__ == "__main__":
-    test_generator()
\ No newline at end of file
+    if "--all" in sys.argv:
+        compare_personalities()
+    else:
+        test_generator()
\ No newline at end of file
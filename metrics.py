@@ -0,0 +1,348 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Stage latency buckets in seconds: sub-millisecond mask work up to multi-second OCR/posting
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Largest profiling request accepted (a profile is only written once every frame is done)
+MAX_PROFILE_FRAMES = 10000
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def samples(self):
+        return [(self.name, {}, self.value)]
+
+
+class Gauge:
+    """A value that is set directly or read from a callback at scrape time"""
+
+    def __init__(self, name, help_text, read=None):
+        self.name = name
+        self.help_text = help_text
+        self.read = read
+        self.value = 0.0
+
+    def set(self, value):
+        self.value = value
+
+    def samples(self):
+        value = self.value
+        if self.read:
+            try:
+                value = self.read()
+            except Exception:
+                value = float('nan')
+        return [(self.name, {}, value)]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label value (e.g. per stage)"""
+
+    def __init__(self, name, help_text, label, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = tuple(buckets)
+        self.series = {}  # label value -> [bucket counts..., count, sum]
+        self.lock = threading.Lock()
+
+    def observe(self, label_value, seconds):
+        with self.lock:
+            series = self.series.setdefault(label_value, [0] * len(self.buckets) + [0, 0.0])
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series[index] += 1
+            series[-2] += 1
+            series[-1] += seconds
+
+    def samples(self):
+        with self.lock:
+            series = {label_value: list(values) for label_value, values in self.series.items()}
+        samples = []
+        for label_value, values in sorted(series.items()):
+            labels = {self.label: label_value}
+            for bound, count in zip(self.buckets, values):
+                samples.append((f"{self.name}_bucket", {**labels, 'le': repr(bound)}, count))
+            samples.append((f"{self.name}_bucket", {**labels, 'le': '+Inf'}, values[-2]))
+            samples.append((f"{self.name}_count", labels, values[-2]))
+            samples.append((f"{self.name}_sum", labels, values[-1]))
+        return samples
+
+    def summary(self, label_value):
+        """(count, average seconds) for one series"""
+        with self.lock:
+            values = self.series.get(label_value)
+            if not values or not values[-2]:
+                return 0, 0.0
+            return values[-2], values[-1] / values[-2]
+
+
+def process_memory_bytes():
+    """Resident set size of this process (psutil if installed, /proc on Linux), or 0"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+class DetectorMetrics:
+    """
+    Counters, gauges and per-stage timing histograms for the detection loop.
+
+    Stages: capture, clip (pre-roll buffering), color, morphology, contours,
+    text, template, ocr, analyze (whole frame), save, handling,
+    llm_first_content (time until the first words of a streamed post are
+    visible) and llm_total (time until a live post is complete, streamed or
+    not). Everything can be rendered in Prometheus text format (see
+    MetricsServer) or dumped to JSON.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.stage_seconds = Histogram('victory_detector_stage_seconds',
+                                       "Time spent in each detection stage", 'stage')
+        self.frames = Counter('victory_detector_frames_total', "Frames analyzed")
+        self.frames_skipped = Counter('victory_detector_frames_skipped_total',
+                                      "Frames skipped (unchanged banner zone or cooldown)")
+        self.candidates = Counter('victory_detector_candidates_total', "Frames with a candidate banner")
+        self.ocr_calls = Counter('victory_detector_ocr_calls_total', "Banner regions sent to EasyOCR")
+        self.near_misses = Counter('victory_detector_near_misses_total', "Banners OCR did not confirm")
+        self.victories = Counter('victory_detector_victories_total', "Victories detected")
+        self.memory = Gauge('victory_detector_memory_bytes', "Resident memory of the detector process",
+                            read=process_memory_bytes)
+        self.uptime = Gauge('victory_detector_uptime_seconds', "Seconds since metrics started",
+                            read=lambda: time.time() - self.started_at)
+        self.metrics = [self.stage_seconds, self.frames, self.frames_skipped, self.candidates,
+                        self.ocr_calls, self.near_misses, self.victories, self.memory, self.uptime]
+        self.lock = threading.Lock()
+
+    def add_gauge(self, name, help_text, read):
+        """Register a gauge read at scrape time, e.g. a queue depth"""
+        gauge = Gauge(name, help_text, read=read)
+        with self.lock:
+            self.metrics = [metric for metric in self.metrics if metric.name != name] + [gauge]
+        return gauge
+
+    def observe(self, stage, seconds):
+        self.stage_seconds.observe(stage, seconds)
+
+    def observe_stages(self, timings):
+        for stage, seconds in timings.items():
+            self.stage_seconds.observe(stage, seconds)
+
+    @contextmanager
+    def time(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds.observe(stage, time.perf_counter() - start)
+
+    def render_prometheus(self):
+        with self.lock:
+            metrics = list(self.metrics)
+        lines = []
+        for metric in metrics:
+            kind = type(metric).__name__.lower()
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {kind}")
+            for name, labels, value in metric.samples():
+                label_text = ",".join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self):
+        with self.lock:
+            metrics = list(self.metrics)
+        result = {}
+        for metric in metrics:
+            if isinstance(metric, Histogram):
+                result[metric.name] = {}
+                for label_value in list(metric.series):
+                    count, average = metric.summary(label_value)
+                    result[metric.name][label_value] = {'count': count, 'average_seconds': average}
+            else:
+                result[metric.name] = metric.samples()[0][2]
+        return result
+
+    def dump_json(self, path):
+        """Write a snapshot to path (via a temp file so readers never see half a file)"""
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'time': time.time(), 'metrics': self.to_dict()}, f, indent=2)
+        os.replace(temp_path, path)
+
+    def stage_summary(self):
+        parts = []
+        for stage in sorted(self.stage_seconds.series):
+            count, average = self.stage_seconds.summary(stage)
+            parts.append(f"{stage} {average * 1000:.1f} ms (n={count})")
+        return "Stage timings: " + (", ".join(parts) if parts else "none yet")
+
+
+class FrameProfiler:
+    """
+    Opt-in profiler for the next N analyzed frames.
+
+    Only the analysis thread runs under the profiler, one frame at a time, so
+    the rest of the pipeline is unaffected. Uses cProfile (saved as a .prof
+    file for snakeviz/pstats) or pyinstrument if requested and installed.
+    """
+
+    def __init__(self, output_folder="profiles", use_pyinstrument=False):
+        self.output_folder = output_folder
+        self.use_pyinstrument = use_pyinstrument
+        self.frames_left = 0
+        self.frames_total = 0
+        self.profiler = None
+        self.lock = threading.Lock()
+
+    def request(self, frames):
+        """Profile the next `frames` frames (called from any thread); ValueError if out of range"""
+        if not 0 < frames <= MAX_PROFILE_FRAMES:
+            raise ValueError(f"frames must be from 1 to {MAX_PROFILE_FRAMES}, got {frames}")
+        with self.lock:
+            if self.frames_left:
+                return False
+            self.frames_left = self.frames_total = frames
+        print(f"🔬 Profiling the next {frames} frames...")
+        return True
+
+    @property
+    def active(self):
+        return self.frames_left > 0
+
+    def run(self, func, *args):
+        """Call func(*args), under the profiler while a profiling request is pending"""
+        if not self.frames_left:
+            return func(*args)
+
+        if self.profiler is None:
+            self.profiler = self.create_profiler()
+        if self.use_pyinstrument:
+            self.profiler.start()
+            try:
+                return func(*args)
+            finally:
+                self.profiler.stop()
+                self.frame_done()
+        try:
+            return self.profiler.runcall(func, *args)
+        finally:
+            self.frame_done()
+
+    def create_profiler(self):
+        if self.use_pyinstrument:
+            try:
+                from pyinstrument import Profiler
+                return Profiler()
+            except ImportError:
+                print("⚠️ pyinstrument not installed, using cProfile")
+                self.use_pyinstrument = False
+        import cProfile
+        return cProfile.Profile()
+
+    def frame_done(self):
+        with self.lock:
+            self.frames_left -= 1
+            if self.frames_left > 0:
+                return
+        self.save()
+
+    def save(self):
+        os.makedirs(self.output_folder, exist_ok=True)
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        profiler, self.profiler = self.profiler, None
+        if self.use_pyinstrument:
+            path = os.path.join(self.output_folder, f"frames_{stamp}.html")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html())
+            print(profiler.output_text())
+        else:
+            import io
+            import pstats
+            path = os.path.join(self.output_folder, f"frames_{stamp}.prof")
+            profiler.dump_stats(path)
+            text = io.StringIO()
+            pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(15)
+            print(text.getvalue())
+        print(f"🔬 Profile of {self.frames_total} frames saved to {path}")
+
+
+class MetricsServer:
+    """
+    Local HTTP endpoint for the detector's metrics.
+
+    GET /metrics       Prometheus text format
+    GET /metrics.json  the same numbers as JSON
+    GET /profile?frames=N  profile the next N analyzed frames
+    """
+
+    def __init__(self, metrics, port=9464, host="127.0.0.1", profiler=None):
+        self.metrics = metrics
+        self.profiler = profiler
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == '/metrics':
+                    self.reply(200, server.metrics.render_prometheus(), "text/plain; version=0.0.4")
+                elif url.path == '/metrics.json':
+                    self.reply(200, json.dumps(server.metrics.to_dict(), indent=2), "application/json")
+                elif url.path == '/profile' and server.profiler:
+                    try:
+                        frames = int(parse_qs(url.query).get('frames', ['50'])[0])
+                        started = server.profiler.request(frames)
+                    except ValueError:
+                        self.reply(400, f"frames must be a number from 1 to {MAX_PROFILE_FRAMES}\n", "text/plain")
+                        return
+                    self.reply(202 if started else 409,
+                               f"profiling {frames} frames\n" if started else "already profiling\n", "text/plain")
+                else:
+                    self.reply(404, "not found\n", "text/plain")
+
+            def reply(self, status, body, content_type):
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would flood the console
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="metrics-server", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        print(f"📊 Metrics on http://127.0.0.1:{self.port}/metrics")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
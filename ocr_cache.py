@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+def roi_hash(roi):
+    """
+    64-bit difference hash (dHash) of an image region.
+
+    The ROI is shrunk to 9x8 grayscale and each bit records whether a pixel is
+    brighter than its right-hand neighbour, so small shifts, rescaling and
+    compression noise flip only a few bits.
+    """
+    gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY) if roi.ndim == 3 else roi
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+class OCRResultCache:
+    """
+    LRU cache of OCR text keyed by ROI perceptual hash.
+
+    A Victory Royale banner (and lobby art that passes the color stage) stays
+    on screen for many frames, so the same pixels would otherwise be read by
+    EasyOCR again and again. Confirmed reads (VICTORY ROYALE) are found by the
+    exact hash or any entry within max_distance bits and kept for ttl
+    seconds. Other text only matches the exact hash and expires after
+    negative_ttl: a banner read mid-animation hashes within a few bits of the
+    fully drawn one, and a fuzzy negative would hide the win. The least
+    recently used entry is evicted past max_size.
+    """
+
+    def __init__(self, max_size=256, ttl=30.0, max_distance=6, negative_ttl=1.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_distance = max_distance
+        self.negative_ttl = negative_ttl
+        self.entries = OrderedDict()  # hash -> (text, confirmed, stored_at)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Return cached text for a hash (or a near-identical confirmed one), or None"""
+        now = time.time()
+        with self.lock:
+            match = key if key in self.entries else None
+            if match is None:
+                for cached_key, (_, confirmed, _) in self.entries.items():
+                    if confirmed and hamming_distance(key, cached_key) <= self.max_distance:
+                        match = cached_key
+                        break
+
+            if match is not None:
+                text, confirmed, stored_at = self.entries[match]
+                if now - stored_at <= (self.ttl if confirmed else self.negative_ttl):
+                    self.entries.move_to_end(match)
+                    self.hits += 1
+                    return text
+                del self.entries[match]
+
+            self.misses += 1
+            return None
+
+    def put(self, key, text, confirmed=False):
+        """Store OCR text for a hash; confirmed marks a VICTORY ROYALE read"""
+        with self.lock:
+            self.entries[key] = (text, confirmed, time.time())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self):
+        return (f"OCR cache: {self.hits} hits, {self.misses} misses "
+                f"({self.hit_rate:.0%} hit rate), {len(self.entries)} entries")
@@ -0,0 +1,132 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+# Only text at or above this EasyOCR confidence counts towards a match
+OCR_CONFIDENCE_THRESHOLD = 0.5
+
+# EasyOCR reader owned by each worker process (created once in _init_worker)
+_worker_reader = None
+
+
+def read_banner_text(reader, roi):
+    """Run EasyOCR on a banner ROI and return the confident text, upper-cased"""
+    results = reader.readtext(roi, detail=1, paragraph=False)
+
+    detected_text = ""
+    for (bbox, text, confidence) in results:
+        if confidence > OCR_CONFIDENCE_THRESHOLD:  # Only consider confident detections
+            detected_text += text.upper() + " "
+    return detected_text.strip()
+
+
+def is_victory_text(detected_text):
+    """Must contain both VICTORY and ROYALE (can be separate)"""
+    return "VICTORY" in detected_text and "ROYALE" in detected_text
+
+
+def _init_worker(gpu):
+    global _worker_reader
+    import easyocr
+    _worker_reader = easyocr.Reader(['en'], gpu=gpu)
+
+
+def _worker_ready():
+    return os.getpid()
+
+
+def _worker_read(roi):
+    return read_banner_text(_worker_reader, roi)
+
+
+class OCRWorkerPool:
+    """
+    Process pool that verifies banner ROIs with EasyOCR off the main process.
+
+    Each worker loads its own easyocr.Reader once when it starts, so jobs only
+    pay for recognition. ROIs are submitted as futures, which lets several
+    candidates be read in parallel on multi-core machines and lets the caller
+    stop waiting (and cancel queued jobs) as soon as one ROI confirms.
+    If a worker dies the executor is unusable; verify() then reports a
+    timeout and sets broken, and restart() replaces the executor.
+    """
+
+    def __init__(self, max_workers=2, gpu=False):
+        self.max_workers = max_workers
+        self.gpu = gpu
+        self.executor = self.create_executor()
+        self.pending = set()
+        self.broken = False
+
+    def create_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self.gpu,)
+        )
+
+    def restart(self):
+        """Replace a broken executor with a fresh one (its workers load the model again)"""
+        self.shutdown()
+        self.executor = self.create_executor()
+        self.broken = False
+
+    def warm_up(self):
+        """Start every worker now so the first real job doesn't pay for model loading"""
+        return [self.executor.submit(_worker_ready) for _ in range(self.max_workers)]
+
+    def submit(self, roi):
+        future = self.executor.submit(_worker_read, roi)
+        self.pending.add(future)
+        future.add_done_callback(self.pending.discard)
+        return future
+
+    def verify(self, rois, timeout=10.0, on_text=None):
+        """
+        Read all ROIs in parallel and return (confirmed, text) for the first match.
+
+        on_text(index, text) is called for every ROI that finishes reading.
+        Jobs still queued when a match is found, or when the timeout (for the
+        whole call) expires, are cancelled. Returns (None, "") on timeout, and
+        also when the pool turns out to be broken.
+        """
+        deadline = time.monotonic() + timeout
+        futures = {}
+        texts = []
+        try:
+            for index, roi in enumerate(rois):
+                futures[self.submit(roi)] = index
+            remaining = set(futures)
+            while remaining:
+                done, remaining = wait(remaining, timeout=max(0.0, deadline - time.monotonic()),
+                                       return_when=FIRST_COMPLETED)
+                if not done:
+                    return None, " | ".join(texts)
+                for future in done:
+                    try:
+                        text = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        print(f"⚠️ OCR error in region: {e}")
+                        continue
+                    print(f"🔤 OCR detected: '{text}' (confidence threshold: {OCR_CONFIDENCE_THRESHOLD})")
+                    if on_text:
+                        on_text(futures[future], text)
+                    if is_victory_text(text):
+                        return True, text
+                    texts.append(text)
+            return False, " | ".join(texts)
+        except BrokenProcessPool as e:
+            self.broken = True
+            print(f"⚠️ OCR worker pool is broken: {e}")
+            return None, " | ".join(texts)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self):
+        for future in list(self.pending):
+            future.cancel()
+        self.executor.shutdown(wait=False)
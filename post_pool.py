@@ -0,0 +1,176 @@
+import json
+import os
+import threading
+import time
+
+SIGNATURE_SEPARATOR = "\n\n---\n"
+
+
+def ordinal(number):
+    """1 -> '1st', 2 -> '2nd', 11 -> '11th', 23 -> '23rd'"""
+    suffix = 'th' if 10 <= number % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(number % 10, 'th')
+    return f"{number}{suffix}"
+
+
+def patch_details(post_text, extra_details):
+    """Add game details to a pre-generated post, just above the signature"""
+    parts = []
+    if 'kills' in extra_details:
+        parts.append(f"{extra_details['kills']} eliminations")
+    if 'mode' in extra_details:
+        parts.append(extra_details['mode'])
+    if not parts:
+        return post_text  # Placement alone adds nothing: every pooled post is about a win
+    if 'placement' in extra_details:
+        parts.append(f"{ordinal(int(extra_details['placement']))} place")
+    line = "🎮 " + " · ".join(parts)
+    body, separator, signature = post_text.partition(SIGNATURE_SEPARATOR)
+    return f"{body}\n\n{line}{separator}{signature}"
+
+
+class PostPool:
+    """
+    Posts generated ahead of time, so a win has its text the moment it's confirmed.
+
+    Keeps `size` ready posts per personality in a JSON file that survives
+    restarts. A background thread tops the pool up while detection is idle,
+    at most max_per_hour generations an hour and daily_budget a day (each
+    one is a paid API call), and posts older than max_age are thrown away.
+    With extra_details, details_mode 'patch' adds them to a pooled post and
+    'live' skips the pool so the LLM writes them into the post.
+    """
+
+    def __init__(self, path=os.path.join("victory_screenshots", "post_pool.json"), personalities=("business_bro",),
+                 size=2, max_age=7 * 86400, max_per_hour=10, daily_budget=20, details_mode='patch'):
+        self.path = path
+        self.personalities = list(personalities)
+        self.size = size
+        self.max_age = max_age
+        self.max_per_hour = max_per_hour
+        self.daily_budget = daily_budget
+        self.details_mode = details_mode
+
+        self.generator = None
+        self.idle = lambda: True
+        self.lock = threading.Lock()
+        self.wake_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        self.hits = 0
+        self.misses = 0
+
+        self.posts = []  # {'personality', 'text', 'created_at'}, oldest first
+        self.generated_at = []  # Generation times in the last day, for the rate limits
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.posts = data.get('posts', [])
+            self.generated_at = data.get('generated_at', [])
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read post pool {self.path}: {e}")
+        self.evict()
+
+    def save(self):
+        """Write the pool via a temp file so a crash never leaves half a file (call with the lock held)"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'posts': self.posts, 'generated_at': self.generated_at}, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def evict(self):
+        """Drop stale posts, pool overflow and generation times older than a day"""
+        now = time.time()
+        self.posts = [post for post in self.posts if now - post['created_at'] < self.max_age]
+        for personality in set(post['personality'] for post in self.posts):
+            extra = len([post for post in self.posts if post['personality'] == personality]) - self.size
+            while extra > 0:
+                oldest = next(post for post in self.posts if post['personality'] == personality)
+                self.posts.remove(oldest)
+                extra -= 1
+        self.generated_at = [t for t in self.generated_at if now - t < 86400]
+
+    def take(self, personality, extra_details=None):
+        """A ready post for this personality (removed from the pool), or None to generate live"""
+        if extra_details and self.details_mode == 'live':
+            return None
+        with self.lock:
+            self.evict()
+            post = next((post for post in self.posts if post['personality'] == personality), None)
+            if post is None:
+                self.misses += 1
+                return None
+            self.posts.remove(post)
+            self.hits += 1
+            self.save()
+        self.wake_event.set()  # Refill the slot that was just used
+        text = post['text']
+        return patch_details(text, extra_details) if extra_details else text
+
+    def ready(self, personality):
+        with self.lock:
+            return len([post for post in self.posts if post['personality'] == personality])
+
+    def next_to_fill(self):
+        """Personality that is short of posts, if the rate limits allow a generation now"""
+        now = time.time()
+        with self.lock:
+            self.evict()
+            if len(self.generated_at) >= self.daily_budget:
+                return None
+            if len([t for t in self.generated_at if now - t < 3600]) >= self.max_per_hour:
+                return None
+            counts = {personality: 0 for personality in self.personalities}
+            for post in self.posts:
+                if post['personality'] in counts:
+                    counts[post['personality']] += 1
+        short = [personality for personality, count in counts.items() if count < self.size]
+        return min(short, key=counts.get) if short else None
+
+    def start(self, generator, idle=None):
+        """Start refilling in the background with a LinkedInPostGenerator"""
+        self.generator = generator
+        if idle is not None:
+            self.idle = idle
+        if self.thread is None:
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self.run, name="post-pool", daemon=True)
+            self.thread.start()
+        return self
+
+    def run(self, check_interval=30.0):
+        while not self.stop_event.is_set():
+            personality = self.next_to_fill() if self.idle() else None
+            if personality is None:
+                self.wake_event.wait(check_interval)
+                self.wake_event.clear()
+                continue
+
+            text = self.generator.generate_post(personality=personality)
+            with self.lock:
+                self.generated_at.append(time.time())
+                if text:
+                    self.posts.append({'personality': personality, 'text': text, 'created_at': time.time()})
+                self.save()
+            if not text:
+                self.stop_event.wait(check_interval)  # API trouble; don't hammer it
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5.0)
+            self.thread = None
+
+    def summary(self):
+        with self.lock:
+            ready = len(self.posts)
+            spent = len(self.generated_at)
+        return (f"Post pool: {ready} ready, {self.hits} used, {self.misses} generated live, "
+                f"{spent}/{self.daily_budget} generations in the last day")
@@ -0,0 +1,37 @@
+import os
+
+CONFIG_FILE = "detector_config.txt"
+
+
+def load_preferences(config_file=CONFIG_FILE):
+    """Load user preferences from config file (defaults if there is none yet)"""
+    default_prefs = {
+        'generate_immediately': True,
+        'request_extra_details': False,
+        'review_later': False,
+        'linkedin_automation': 'semi-auto',  # 'full-auto', 'semi-auto', or 'manual'
+        'personality_mode': 'business_bro'  # Default personality
+    }
+
+    try:
+        if os.path.exists(config_file):
+            with open(config_file, 'r') as f:
+                prefs = {}
+                for line in f:
+                    key, value = line.strip().split('=')
+                    if key in ['linkedin_automation', 'personality_mode']:
+                        prefs[key] = value
+                    else:
+                        prefs[key] = value.lower() == 'true'
+                return prefs
+    except:
+        pass
+
+    return default_prefs
+
+
+def save_preferences(prefs, config_file=CONFIG_FILE):
+    """Save user preferences to config file"""
+    with open(config_file, 'w') as f:
+        for key, value in prefs.items():
+            f.write(f"{key}={value}\n")
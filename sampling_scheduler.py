@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import deque
+
+
+class AdaptiveScheduler:
+    """
+    Picks the capture interval from what the detector has been seeing.
+
+    - no_window: the Fortnite window isn't found, so polling backs off
+      exponentially from idle_interval up to no_window_interval.
+    - playing: the game is up, sample at idle_interval.
+    - burst: a candidate banner was just seen, sample at burst_interval for
+      burst_duration seconds so the confirming frame arrives quickly.
+
+    Whatever the state, the interval never drops below the measured CPU cost
+    of one frame divided by cpu_budget (the share of one core the detector is
+    allowed to use). Costs are thread CPU time of the capture and analysis
+    stages; OCR worker processes are not counted.
+    """
+
+    NO_WINDOW = 'no_window'
+    PLAYING = 'playing'
+    BURST = 'burst'
+
+    def __init__(self, idle_interval=0.5, burst_interval=0.1, burst_duration=3.0,
+                 no_window_interval=4.0, cpu_budget=0.5, history_size=600):
+        self.idle_interval = idle_interval
+        self.burst_interval = burst_interval
+        self.burst_duration = burst_duration
+        self.no_window_interval = no_window_interval
+        self.cpu_budget = cpu_budget
+
+        self.state = self.PLAYING
+        self.burst_until = 0.0
+        self.no_window_interval_current = idle_interval
+        self.capture_cost = 0.0   # EMA of capture CPU seconds per frame
+        self.analysis_cost = 0.0  # EMA of analysis CPU seconds per frame
+
+        # (timestamp, interval, state) for every interval handed out
+        self.history = deque(maxlen=history_size)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def smooth(average, sample, weight=0.2):
+        return sample if average == 0.0 else average + weight * (sample - average)
+
+    def record_capture(self, cpu_seconds, window_found):
+        with self.lock:
+            self.capture_cost = self.smooth(self.capture_cost, cpu_seconds)
+            if window_found:
+                self.no_window_interval_current = self.idle_interval
+                if self.state == self.NO_WINDOW:
+                    self.state = self.PLAYING
+            elif self.state != self.BURST:
+                self.state = self.NO_WINDOW
+
+    def record_analysis(self, cpu_seconds, candidate_seen):
+        with self.lock:
+            self.analysis_cost = self.smooth(self.analysis_cost, cpu_seconds)
+            if candidate_seen:
+                self.state = self.BURST
+                self.burst_until = time.time() + self.burst_duration
+
+    @property
+    def budget_floor(self):
+        """Shortest interval that keeps per-frame CPU within cpu_budget"""
+        if not self.cpu_budget:
+            return 0.0
+        return (self.capture_cost + self.analysis_cost) / self.cpu_budget
+
+    def next_interval(self):
+        with self.lock:
+            now = time.time()
+            if self.state == self.BURST and now >= self.burst_until:
+                self.state = self.PLAYING
+
+            if self.state == self.BURST:
+                interval = self.burst_interval
+            elif self.state == self.NO_WINDOW:
+                interval = self.no_window_interval_current
+                self.no_window_interval_current = min(self.no_window_interval, interval * 2)
+            else:
+                interval = self.idle_interval
+
+            interval = max(interval, self.budget_floor)
+            self.history.append((now, interval, self.state))
+            return interval
+
+    def summary(self):
+        with self.lock:
+            history = list(self.history)
+            floor = self.budget_floor
+        if not history:
+            return "Scheduler: no samples yet"
+        intervals = [interval for _, interval, _ in history]
+        states = {}
+        for _, _, state in history:
+            states[state] = states.get(state, 0) + 1
+        state_text = ", ".join(f"{state} {count}" for state, count in states.items())
+        return (f"Scheduler: interval min {min(intervals):.2f}s / avg {sum(intervals) / len(intervals):.2f}s / "
+                f"max {max(intervals):.2f}s, CPU floor {floor:.2f}s, states: {state_text}")
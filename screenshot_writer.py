@@ -0,0 +1,113 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import cv2
+
+
+class ScreenshotWriter:
+    """
+    Background thread that encodes and writes victory screenshots.
+
+    write() only queues the frame, so detection never waits on PNG encoding
+    or the disk. The frame is used as-is, not copied: the caller hands it
+    over and must not modify it afterwards. Files are written to a temp name
+    and renamed into place, so nothing ever sees half a PNG. The queue is
+    bounded (a full queue makes write() wait rather than hold unbounded 4K
+    frames in memory) and close() flushes whatever is still queued.
+    """
+
+    def __init__(self, png_compression=None, max_pending=8):
+        # PNG zlib level 0-9, or None for OpenCV's default (the fastest to
+        # encode; level 9 takes ~20x longer on a 4K frame for ~20% less disk)
+        self.png_compression = png_compression
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.pending = {}  # filepath -> Future, until the file is in place
+        self.lock = threading.Lock()
+
+        self.files_written = 0
+        self.bytes_written = 0
+        self.write_time = 0.0
+        self.max_write_time = 0.0
+
+        self.thread = threading.Thread(target=self.run, name="screenshot-writer", daemon=True)
+        self.thread.start()
+
+    def write(self, image, filepath):
+        """Queue image to be saved at filepath; returns a Future that resolves to filepath"""
+        future = Future()
+        with self.lock:
+            self.pending[filepath] = future
+        self.queue.put((image, filepath, future))
+        return future
+
+    def wait(self, filepath, timeout=10.0):
+        """Block until a queued screenshot is on disk (e.g. before uploading it); True if it is"""
+        with self.lock:
+            future = self.pending.get(filepath)
+        if future is None:
+            return os.path.exists(filepath)
+        try:
+            future.result(timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+            image, filepath, future = item
+            try:
+                self.save(image, filepath)
+                future.set_result(filepath)
+            except Exception as e:
+                print(f"❌ Could not save screenshot {filepath}: {e}")
+                future.set_exception(e)
+            finally:
+                with self.lock:
+                    self.pending.pop(filepath, None)
+                self.queue.task_done()
+
+    def save(self, image, filepath):
+        start = time.perf_counter()
+        extension = os.path.splitext(filepath)[1] or '.png'
+        params = []
+        if extension.lower() == '.png' and self.png_compression is not None:
+            params = [cv2.IMWRITE_PNG_COMPRESSION, self.png_compression]
+        ok, encoded = cv2.imencode(extension, image, params)
+        if not ok:
+            raise ValueError(f"Could not encode {extension} image")
+
+        temp_path = filepath + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(encoded)
+        os.replace(temp_path, filepath)
+
+        elapsed = time.perf_counter() - start
+        self.files_written += 1
+        self.bytes_written += encoded.nbytes
+        self.write_time += elapsed
+        self.max_write_time = max(self.max_write_time, elapsed)
+
+    def flush(self):
+        """Wait until every queued screenshot has been written"""
+        self.queue.join()
+
+    def close(self):
+        """Write everything still queued, then stop the thread"""
+        if not self.thread.is_alive():
+            return
+        if self.queue.unfinished_tasks:
+            print(f"💾 Writing {self.queue.unfinished_tasks} queued screenshot(s)...")
+        self.queue.put(None)
+        self.thread.join()
+
+    def summary(self):
+        average = self.write_time / self.files_written * 1000 if self.files_written else 0.0
+        return (f"Screenshot writer: {self.files_written} files, {self.bytes_written / 1e6:.1f} MB, "
+                f"avg {average:.0f} ms, max {self.max_write_time * 1000:.0f} ms (off the detection thread)")
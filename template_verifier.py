@@ -0,0 +1,125 @@
+import threading
+
+import cv2
+import numpy as np
+
+from frame_analysis import FrameAnalysis, TEXT_WHITE_LOWER, TEXT_WHITE_UPPER
+from ocr_cache import roi_hash, hamming_distance
+
+# Templates are stored as white-text masks of banners scaled to this width
+TEMPLATE_WIDTH = 128
+
+# Banner boxes from a live frame can be a little looser than the template
+# (merged fragments, capture scaling), so they are tried at a few widths
+MATCH_SCALES = (1.0, 1.15, 1.3, 1.5)
+
+
+class TemplateVerifier:
+    """
+    Fast "VICTORY ROYALE" check using normalized cross-correlation.
+
+    The template bank is built from the banners of wins EasyOCR confirmed
+    (see victory_history.confirmed_screenshots), never from template-confirmed
+    ones, so a wrong verdict can't feed itself. Banners are compared by their
+    white-text mask: banner shape and color are the same on many screens,
+    the lettering isn't. A banner box accepted by the visual stage is matched
+    against every template at a few scales; a high best score confirms it
+    outright, a very low one (no such lettering) rejects it, and anything in
+    between is left for EasyOCR.
+    """
+
+    ACCEPT = 'accept'
+    REJECT = 'reject'
+    AMBIGUOUS = 'ambiguous'
+
+    def __init__(self, accept_threshold=0.9, reject_threshold=0.15, max_templates=24):
+        self.accept_threshold = accept_threshold
+        self.reject_threshold = reject_threshold
+        self.max_templates = max_templates
+        self.templates = []
+        self.counts = {self.ACCEPT: 0, self.REJECT: 0, self.AMBIGUOUS: 0}
+        self.lock = threading.Lock()
+
+    def build_from_paths(self, paths, min_area=10000):
+        """Extract banner templates from victory screenshots (OCR-confirmed ones)"""
+        for path in paths:
+            image = cv2.imread(path)
+            if image is None:
+                continue
+            for template in extract_banner_templates(image, min_area):
+                self.add_template(template)
+                if len(self.templates) >= self.max_templates:
+                    return len(self.templates)
+        return len(self.templates)
+
+    def add_template(self, template):
+        """Add a template unless a near-identical one is already in the bank"""
+        key = roi_hash(template)
+        if any(hamming_distance(key, existing_key) <= 4 for existing_key, _ in self.templates):
+            return False
+        self.templates.append((key, template))
+        return True
+
+    def best_score(self, roi):
+        """Highest normalized cross-correlation of the ROI's text mask against any template"""
+        text = text_mask(roi)
+        roi_height, roi_width = text.shape[:2]
+        if roi_width == 0 or roi_height == 0:
+            return -1.0
+
+        best = -1.0
+        for scale in MATCH_SCALES:
+            width = round(TEMPLATE_WIDTH * scale)
+            height = max(1, round(roi_height * width / roi_width))
+            resized = cv2.resize(text, (width, height), interpolation=cv2.INTER_AREA)
+            for _, template in self.templates:
+                if template.shape[0] > height or template.shape[1] > width:
+                    continue
+                score = float(cv2.matchTemplate(resized, template, cv2.TM_CCOEFF_NORMED).max())
+                # A banner without any white text correlates with nothing
+                best = max(best, score if np.isfinite(score) else 0.0)
+        return best
+
+    def classify(self, roi):
+        """Return (verdict, score): ACCEPT, REJECT, or AMBIGUOUS (needs OCR)"""
+        if not self.templates:
+            verdict, score = self.AMBIGUOUS, -1.0
+        else:
+            score = self.best_score(roi)
+            if score >= self.accept_threshold:
+                verdict = self.ACCEPT
+            elif score <= self.reject_threshold:
+                verdict = self.REJECT
+            else:
+                verdict = self.AMBIGUOUS
+        with self.lock:
+            self.counts[verdict] += 1
+        return verdict, score
+
+    @property
+    def ocr_fallback_rate(self):
+        """Share of banner candidates the templates could not decide on"""
+        total = sum(self.counts.values())
+        return self.counts[self.AMBIGUOUS] / total if total else 0.0
+
+    def summary(self):
+        return (f"Template verifier: {len(self.templates)} templates, "
+                f"{self.counts[self.ACCEPT]} accepted, {self.counts[self.REJECT]} rejected, "
+                f"{self.counts[self.AMBIGUOUS]} ambiguous ({self.ocr_fallback_rate:.0%} of banners)")
+
+
+def text_mask(roi):
+    """White-text mask of a banner crop (the lettering, without the banner behind it)"""
+    hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+    return cv2.inRange(hsv, TEXT_WHITE_LOWER, TEXT_WHITE_UPPER)
+
+
+def extract_banner_templates(image, min_area=10000):
+    """Banner text masks (TEMPLATE_WIDTH wide) from a victory screenshot"""
+    analysis = FrameAnalysis(image, crop_to_banner_zone=True)
+    templates = []
+    for x, y, w, h in analysis.banner_rects(min_area):
+        height = max(8, round(h * TEMPLATE_WIDTH / w))
+        text = text_mask(image[y:y + h, x:x + w])
+        templates.append(cv2.resize(text, (TEMPLATE_WIDTH, height), interpolation=cv2.INTER_AREA))
+    return templates
@@ -1,29 +1,39 @@
-import cv2
 import numpy as np
-import pyautogui
 import time
 from datetime import datetime
 import os
 import threading
-import easyocr
-from llm_post_generator import LinkedInPostGenerator
-from linkedin_poster import post_victory_full_auto, post_victory_semi_auto
+from detection_pipeline import DetectionPipeline
+from sampling_scheduler import AdaptiveScheduler
+from frame_analysis import FrameAnalysis
+from template_verifier import TemplateVerifier
+from change_tracker import TileChangeTracker
+from capture_backends import create_capture_backend
+from metrics import DetectorMetrics, FrameProfiler, MetricsServer
+from fingerprint_store import FingerprintStore, frame_fingerprint, fingerprint_hex
+from victory_history import VictoryHistory, confirmed_screenshots
+from screenshot_writer import ScreenshotWriter
+from clip_recorder import ClipRecorder
+from job_queue import JobQueue, JobWorkers
+from post_pool import PostPool
+from preferences import CONFIG_FILE, load_preferences, save_preferences
+from ocr_cache import OCRResultCache, roi_hash, hamming_distance
+from ocr_pool import OCRWorkerPool, OCR_CONFIDENCE_THRESHOLD, read_banner_text, is_victory_text
 
-class VictoryDetector:
-    def __init__(self):
-        self.running = False
-        self.screenshot_folder = "victory_screenshots"
-        self.config_file = "detector_config.txt"
-        
-        # Detection state
-        self.last_detection_time = 0
-        self.last_screenshot = None
-        self.cooldown_active = False
-        self.waiting_for_screen_change = False
-        
-        # Create screenshots folder
-        if not os.path.exists(self.screenshot_folder):
-            os.makedirs(self.screenshot_folder)
+class BannerDetector:
+    """
+    Victory Royale recognition on single frames: color stage, banner
+    templates and OCR, with no persistence or posting side effects.
+    
+    VictoryDetector builds on this for live detection. On its own it is what
+    offline tools use (vod_scanner.py worker processes, benchmark.py), so they
+    never open the victory history, the job queue or the post pool.
+    """
+    
+    def __init__(self, load_ocr=True, cascade_width=None, ocr_workers=2,
+                 template_db=os.path.join("victory_screenshots", "victories.db")):
+        self.startup_timings = {}
+        self.template_db = template_db  # Victory history the templates come from (read-only)
         
         # Victory Royale color ranges (HSV) - updated based on screenshots
         # Blue victory banner (from screenshots 1 & 2)
@@ -40,58 +50,409 @@ class VictoryDetector:
         
         # Minimum area for detection (adjust based on screen size)
         self.min_area = 5000
-        
-        # Initialize OCR reader (loads once at startup)
-        print("🔤 Loading OCR model...")
-        self.ocr_reader = easyocr.Reader(['en'], gpu=False)  # Set gpu=True if you have CUDA
-        
-        # Initialize LLM post generator
+        self.last_score = 0
+        
+        # Cascade mode: run banner detection on a frame downscaled to this width
+        # (e.g. 960) and only go back to full resolution for OCR. None = native.
+        self.cascade_width = cascade_width
+        
+        # Only convert the top of the frame where a banner can actually be
+        # (see frame_analysis.banner_zone_bottom, cached per capture size)
+        self.crop_to_banner_zone = True
+        
+        # OCR is slow to import/load, so it's loaded by warm_up_detection()
+        # (VictoryDetector runs that on a background thread while color-only
+        # detection already runs). load_ocr can be turned off for color-only runs.
+        # With ocr_workers > 0 each worker process loads its own reader and
+        # candidates are verified in parallel; ocr_workers=0 reads inline.
+        self.ocr_reader = None
+        self.ocr_pool = None
+        self.ocr_timeout = 10.0  # Seconds to wait for OCR before giving up on a frame
+        self.ocr_cache = OCRResultCache(max_size=256, ttl=30.0, max_distance=6, negative_ttl=1.0)
+        self.ocr_ready = threading.Event()
+        
+        # Stage timings, counters and gauges (see metrics.py)
+        self.metrics = DetectorMetrics()
+        self.last_analysis = None
+        
+        # Template bank from OCR-confirmed victories, filled in by warm_up_detection()
+        self.template_verifier = TemplateVerifier()
+        self.ocr_frames = 0  # Frames that still needed EasyOCR after the cache and template check
+        if load_ocr and ocr_workers:
+            self.ocr_pool = OCRWorkerPool(max_workers=ocr_workers, gpu=False)  # Set gpu=True if you have CUDA
+    
+    def warm_up_detection(self, load_ocr=True):
+        """Build the banner templates and load OCR (sets ocr_ready when done, even if it failed)"""
+        if load_ocr:
+            start = time.perf_counter()
+            paths = confirmed_screenshots(self.template_db)
+            count = self.template_verifier.build_from_paths(paths, min_area=self.min_area * 2)
+            self.startup_timings['templates'] = time.perf_counter() - start
+            print(f"🧩 Built {count} banner templates from {len(paths)} OCR-confirmed wins")
+        
+        # Initialize OCR (loads once)
+        start = time.perf_counter()
         try:
-            print("🤖 Initializing LLM post generator...")
-            self.post_generator = LinkedInPostGenerator()
-            print("✅ LLM ready!")
+            if self.ocr_pool:
+                try:
+                    print(f"🔤 Starting {self.ocr_pool.max_workers} OCR worker(s)...")
+                    for future in self.ocr_pool.warm_up():
+                        future.result()
+                except Exception as e:
+                    # Workers that can't start leave the executor broken for good
+                    print(f"⚠️ OCR workers failed to start ({e}), reading in this process instead")
+                    self.ocr_pool.shutdown()
+                    self.ocr_pool = None
+            if load_ocr and not self.ocr_pool:
+                import easyocr
+                print("🔤 Loading OCR model...")
+                self.ocr_reader = easyocr.Reader(['en'], gpu=False)  # Set gpu=True if you have CUDA
+            if load_ocr:
+                self.startup_timings['ocr model'] = time.perf_counter() - start
+                print("✅ OCR ready!")
         except Exception as e:
-            print(f"⚠️ LLM initialization failed: {e}")
-            self.post_generator = None
+            print(f"⚠️ OCR initialization failed: {e}")
+        finally:
+            self.ocr_ready.set()
+    
+    def detect_victory_with_ocr(self, image):
+        """Hybrid detection: Visual banner + OCR text verification"""
+        
+        # Masks and contours are computed once per frame and shared by both stages
+        analysis = FrameAnalysis(image, self.cascade_width, self.crop_to_banner_zone)
+        self.last_analysis = analysis  # Its per-stage timings feed the metrics
+        
+        # Step 1: Visual banner detection (existing logic)
+        visual_detected, color_mask = self.detect_victory_colors(image, analysis)
+        
+        if not visual_detected:
+            return False, color_mask, "No visual banner detected"
+        
+        # Step 2: OCR verification in potential banner areas
+        # Get bounding boxes of potential banners from the raw color mask
+        img_height, img_width = image.shape[:2]
+        rois = []
+        
+        for rect in analysis.proposal_rects(analysis.scaled_area(self.min_area)):
+            # Crop from the original frame, not the cascade working image
+            x, y, w, h = analysis.to_full_resolution(rect)
+            
+            # Expand search area around banner for text
+            search_x1 = max(0, x - 20)
+            search_y1 = max(0, y - 20)
+            search_x2 = min(img_width, x + w + 20)
+            search_y2 = min(img_height, y + h + 20)
+            
+            # Extract region of interest
+            roi = image[search_y1:search_y2, search_x1:search_x2]
+            
+            if roi.size > 0:
+                rois.append(roi)
+        
+        # Banners stay on screen for seconds, so most candidates were already read
+        victory_text_found = False
+        ocr_rois, ocr_hashes = [], []  # Candidates still to be read
+        for roi in rois:
+            key = roi_hash(roi)
+            cached_text = self.ocr_cache.get(key)
+            if cached_text is None:
+                ocr_rois.append(roi)
+                ocr_hashes.append(key)
+            elif is_victory_text(cached_text):
+                print(f"🔤 OCR cache hit: '{cached_text}'")
+                victory_text_found = True
+                break
+        
+        if victory_text_found:
+            print("✅ OCR confirmed: Found 'VICTORY' and 'ROYALE' text!")
+            return True, color_mask, "Visual banner + OCR text confirmed"
+        
+        # Cheap template match on the banners the visual stage accepted first;
+        # only when it is unsure do the candidates go to EasyOCR. The templates
+        # are the lettering of OCR-confirmed wins, so a banner with other text
+        # (or none) never matches one
+        verdicts = []
+        for rect in analysis.banner_rects(analysis.scaled_area(self.min_area * 2)):
+            x, y, w, h = analysis.to_full_resolution(rect)
+            with analysis.timed('template'):
+                verdict, score = self.template_verifier.classify(image[y:y+h, x:x+w])
+            if verdict == TemplateVerifier.ACCEPT:
+                print(f"🧩 Template match confirmed banner (score {score:.2f})")
+                return True, color_mask, "Visual banner + template match confirmed"
+            verdicts.append(verdict)
+        
+        if verdicts and all(verdict == TemplateVerifier.REJECT for verdict in verdicts):
+            return False, color_mask, "Visual banner found but template match rejected it"
+        
+        if not ocr_rois:
+            return False, color_mask, "Visual banner found but no 'VICTORY ROYALE' text detected"
+        
+        # OCR may still be warming up right after startup
+        if not self.ocr_ready.wait(self.ocr_timeout):
+            return False, color_mask, "Visual banner found but OCR model still loading"
+        if not self.ocr_pool and self.ocr_reader is None:
+            return False, color_mask, "Visual banner found but OCR is unavailable"
+        
+        self.ocr_frames += 1
+        self.metrics.ocr_calls.inc(len(ocr_rois))
+        
+        def remember(index, text):
+            self.ocr_cache.put(ocr_hashes[index], text, confirmed=is_victory_text(text))
+        
+        with analysis.timed('ocr'):
+            if self.ocr_pool:
+                # Read every candidate in parallel; queued jobs are cancelled once one confirms
+                victory_text_found, _ = self.ocr_pool.verify(ocr_rois, timeout=self.ocr_timeout, on_text=remember)
+                if self.ocr_pool.broken:
+                    # A worker died after startup; the next candidate gets a fresh pool
+                    print("🔤 Restarting OCR workers...")
+                    self.ocr_pool.restart()
+            else:
+                victory_text_found = self.verify_rois_inline(ocr_rois, on_text=remember)
+        if victory_text_found is None:
+            return False, color_mask, "Visual banner found but OCR timed out"
+        
+        if victory_text_found:
+            print("✅ OCR confirmed: Found 'VICTORY' and 'ROYALE' text!")
+            return True, color_mask, "Visual banner + OCR text confirmed"
+        else:
+            return False, color_mask, "Visual banner found but no 'VICTORY ROYALE' text detected"
+    
+    def verify_rois_inline(self, rois, on_text=None):
+        """Run OCR on each candidate ROI in this process until one reads VICTORY ROYALE"""
+        for index, roi in enumerate(rois):
+            try:
+                # Run OCR on the banner region
+                detected_text = read_banner_text(self.ocr_reader, roi)
+                print(f"🔤 OCR detected: '{detected_text}' (confidence threshold: {OCR_CONFIDENCE_THRESHOLD})")
+                if on_text:
+                    on_text(index, detected_text)
+                
+                if is_victory_text(detected_text):
+                    return True
+            except Exception as e:
+                print(f"⚠️ OCR error in region: {e}")
+                continue
+        return False
+    
+    def detect_victory_colors(self, image, analysis=None):
+        """Detect victory royale banner colors and patterns in image - STRICT MODE"""
+        # HSV conversion, color masks and morphology live in FrameAnalysis so
+        # detect_victory_with_ocr can reuse them instead of recomputing
+        if analysis is None:
+            analysis = FrameAnalysis(image, self.cascade_width, self.crop_to_banner_zone)
+        
+        # In cascade mode the masks are downscaled, so pixel thresholds are too
+        img_height, img_width = analysis.shape
+        min_banner_area = analysis.scaled_area(self.min_area * 2)
+        min_white_pixels = analysis.scaled_area(2000)
+        pad = round(analysis.scaled(20))
+        
+        color_mask = analysis.closed_mask
+        
+        victory_score = 0
+        banner_found = False
+        
+        # Much stricter banner detection: area (double the minimum), shape and
+        # position rules live in FrameAnalysis.banner_rects
+        for rect in analysis.banner_rects(min_banner_area):
+            banner_found = True
+            victory_score += 2
+            
+            # Look for "VICTORY ROYALE" text in and around the banner
+            x, y, w, h = rect
+            search_box = (max(0, x-pad), max(0, y-pad), min(img_width, x+w+pad), min(img_height, y+h+pad))
+            
+            # Counted from the frame's integral image rather than summing the slice
+            white_pixels = analysis.white_pixels(*search_box)
+            if white_pixels > min_white_pixels:  # Substantial white text
+                victory_score += 3
+                
+                # Additional check: look for text that spans most of banner width
+                if analysis.white_text_span(*search_box) > w * 0.6:  # Text spans 60% of banner width
+                    victory_score += 2
+        
+        # Much higher threshold - need strong evidence
+        is_victory = victory_score >= 4 and banner_found
+        self.last_score = victory_score
+        
+        if victory_score > 0:
+            print(f"🔍 Detection score: {victory_score}/7 (need ≥4)")
+        
+        return is_victory, color_mask
+    
+    def close(self):
+        """Stop background OCR workers"""
+        if self.ocr_pool:
+            self.ocr_pool.shutdown()
+            self.ocr_pool = None
+
+class VictoryDetector(BannerDetector):
+    def __init__(self, load_ocr=True, load_llm=True, cascade_width=None, ocr_workers=2, capture=None,
+                 png_compression=None, clip_seconds=5.0, clip_format='mp4', job_workers=2, post_pool_size=0,
+                 stream_posts=True):
+        self.created_at = time.perf_counter()
+        self.started_at = self.created_at  # Reset when live detection starts
+        self.screenshot_folder = "victory_screenshots"
+        
+        # Color stage, templates and OCR (see BannerDetector)
+        super().__init__(load_ocr, cascade_width, ocr_workers,
+                         template_db=os.path.join(self.screenshot_folder, "victories.db"))
+        self.first_frame_analyzed = False
+        self.running = False
+        
+        # Capture backend (see capture_backends.py); picked for the platform on first use
+        self.capture = capture
+        
+        # Signals for the adaptive sampling scheduler
+        self.window_found = True
+        self.last_frame_candidate = False
+        self.config_file = CONFIG_FILE
+        
+        # Detection state
+        self.last_detection_time = 0
+        self.last_fingerprint = None  # 256-bit fingerprint of the last victory frame
+        # Fingerprint bits (of 256) that must differ before cooldown ends. Each bit compares the
+        # brightness of two neighbouring cells of a 17x16 grid, so 24 is ~9% of those comparisons flipping
+        self.min_change_distance = 24
+        self.cooldown_active = False
+        self.waiting_for_screen_change = False
+        
+        # Create screenshots folder
+        if not os.path.exists(self.screenshot_folder):
+            os.makedirs(self.screenshot_folder)
+        
+        # Every win is indexed in SQLite (screenshots stay PNG files); a new
+        # database imports the screenshots already in the folder
+        self.history = VictoryHistory(os.path.join(self.screenshot_folder, "victories.db"), self.screenshot_folder)
+        
+        # Fingerprints of handled victories survive restarts, so the same win
+        # isn't posted twice if the detector is restarted on the victory screen
+        self.fingerprint_store = FingerprintStore(self.history)
+        
+        # Screenshots are encoded and written on a background thread
+        self.screenshot_writer = ScreenshotWriter(png_compression=png_compression)
+        
+        # The last few seconds of captured frames, saved as a clip next to the screenshot (0 = off)
+        # Sized so the pre-roll outlasts the victory frame's wait for OCR
+        self.clip_recorder = (ClipRecorder(clip_seconds, clip_format=clip_format, max_delay=self.ocr_timeout)
+                              if clip_seconds else None)
+        
+        # Post generation, LinkedIn automation and notifications run as jobs in
+        # an on-disk queue, so they survive restarts and never hold up detection.
+        # Several wins are handled at once, but console prompts and Chrome
+        # sessions (which share one profile folder and can prompt too) take turns
+        self.jobs = JobQueue(os.path.join(self.screenshot_folder, "jobs.db"))
+        self.job_workers = JobWorkers(self.jobs, {'victory': self.run_victory_job}, workers=job_workers)
+        self.interaction_lock = threading.Lock()
+        
+        # Banner analysis is skipped while the banner zone is unchanged and the
+        # previous verdict is reused (only verdicts that weren't cut short by
+        # OCR loading or timing out are reused)
+        self.change_tracker = TileChangeTracker(thumb_width=160, tile_size=10, threshold=3.0)
+        self.last_verdict = None
         
         # Load preferences
         self.preferences = self.load_preferences()
         
+        # Posts generated live are streamed to the console and composer token by token
+        self.stream_posts = stream_posts
+        
+        # Posts for the chosen personality generated ahead of time, so a win
+        # doesn't wait for the LLM (refilled once the LLM client is ready).
+        # Opt-in (post_pool_size > 0): every refill is a paid API call. Created
+        # here or when setup_preferences turns on immediate generation
+        self.post_pool_size = post_pool_size
+        self.post_pool = None
+        self.post_pool_lock = threading.Lock()
+        if post_pool_size and self.preferences.get('generate_immediately'):
+            self.post_pool = self.create_post_pool()
+        
+        # On-demand profiler for analyzed frames (metrics live in BannerDetector)
+        self.profiler = FrameProfiler()
+        
+        # OCR, the LLM client and Selenium are slow to import/load, so they warm
+        # up on a background thread while color-only detection already runs.
+        # load_ocr/load_llm can be turned off for headless color-only runs
+        self._post_generator = None
+        self.llm_ready = threading.Event()
+        
+        threading.Thread(
+            target=self.warm_up_components,
+            args=(load_ocr, load_llm),
+            name="detector-warm-up",
+            daemon=True
+        ).start()
+        
+        self.startup_timings['detector init'] = time.perf_counter() - self.created_at
+        
         print("Victory Royale Detector initialized!")
         print(f"Screenshots will be saved to: {self.screenshot_folder}")
         print(f"Current preferences: {self.preferences}")
     
+    def warm_up_components(self, load_ocr, load_llm):
+        """Load templates, OCR, the LLM client and (if needed) Selenium in the background"""
+        self.warm_up_detection(load_ocr)
+        
+        # Initialize LLM post generator
+        if load_llm:
+            start = time.perf_counter()
+            try:
+                print("🤖 Initializing LLM post generator...")
+                from llm_post_generator import LinkedInPostGenerator
+                self._post_generator = LinkedInPostGenerator()
+                self.startup_timings['llm client'] = time.perf_counter() - start
+                print("✅ LLM ready!")
+            except Exception as e:
+                print(f"⚠️ LLM initialization failed: {e}")
+                self._post_generator = None
+        self.llm_ready.set()
+        self.start_post_pool()
+        
+        # Pre-import Selenium only when a win will actually open LinkedIn
+        if load_llm and self.preferences.get('linkedin_automation', 'manual') != 'manual':
+            start = time.perf_counter()
+            try:
+                import linkedin_poster
+                self.startup_timings['selenium'] = time.perf_counter() - start
+            except Exception as e:
+                print(f"⚠️ LinkedIn automation unavailable: {e}")
+        
+        self.report_startup()
+    
+    def create_post_pool(self):
+        return PostPool(
+            os.path.join(self.screenshot_folder, "post_pool.json"),
+            personalities=[self.preferences.get('personality_mode', 'business_bro')],
+            size=self.post_pool_size
+        )
+    
+    def start_post_pool(self):
+        """Start refilling the post pool once both it and the LLM client exist"""
+        with self.post_pool_lock:
+            if self.post_pool and self.llm_ready.is_set() and self._post_generator:
+                # Top up between candidate banners, not while one is being verified
+                self.post_pool.start(self._post_generator, idle=lambda: not self.last_frame_candidate)
+    
+    @property
+    def post_generator(self):
+        """LLM post generator, waiting for the background warm-up if it is still running"""
+        self.llm_ready.wait()
+        return self._post_generator
+    
+    def report_startup(self):
+        """Print how long each startup component took"""
+        print("⏱️ Startup times:")
+        for component, seconds in self.startup_timings.items():
+            print(f"   {component}: {seconds * 1000:.0f} ms")
+    
     def load_preferences(self):
         """Load user preferences from config file"""
-        default_prefs = {
-            'generate_immediately': True,
-            'request_extra_details': False,
-            'review_later': False,
-            'linkedin_automation': 'semi-auto',  # 'full-auto', 'semi-auto', or 'manual'
-            'personality_mode': 'business_bro'  # Default personality
-        }
-        
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    prefs = {}
-                    for line in f:
-                        key, value = line.strip().split('=')
-                        if key in ['linkedin_automation', 'personality_mode']:
-                            prefs[key] = value
-                        else:
-                            prefs[key] = value.lower() == 'true'
-                    return prefs
-        except:
-            pass
-        
-        return default_prefs
+        return load_preferences(self.config_file)
     
     def save_preferences(self, prefs):
         """Save user preferences to config file"""
-        with open(self.config_file, 'w') as f:
-            for key, value in prefs.items():
-                f.write(f"{key}={value}\n")
+        save_preferences(prefs, self.config_file)
     
     def setup_preferences(self):
         """Interactive preference setup"""
@@ -155,265 +516,41 @@ class VictoryDetector:
         
         self.save_preferences(prefs)
         self.preferences = prefs
+        if prefs['generate_immediately']:
+            if self.post_pool is None and self.post_pool_size:
+                self.post_pool = self.create_post_pool()
+            if self.post_pool:
+                self.post_pool.personalities = [prefs['personality_mode']]
+                self.start_post_pool()
+        elif self.post_pool:
+            self.post_pool.stop()  # Pooled posts are only used when generating right away
         return prefs
     
     def screen_changed_significantly(self, current_screen):
         """Check if screen has changed significantly from last victory detection"""
-        if self.last_screenshot is None:
+        if self.last_fingerprint is None:
             return True
-            
-        # Compare current screen to last detection screenshot
-        # Convert both to grayscale for comparison
-        current_gray = cv2.cvtColor(current_screen, cv2.COLOR_BGR2GRAY)
-        last_gray = cv2.cvtColor(self.last_screenshot, cv2.COLOR_BGR2GRAY)
-        
-        # Resize both to same size for comparison
-        height, width = min(current_gray.shape[0], last_gray.shape[0]), min(current_gray.shape[1], last_gray.shape[1])
-        current_resized = cv2.resize(current_gray, (width, height))
-        last_resized = cv2.resize(last_gray, (width, height))
-        
-        # Calculate difference
-        diff = cv2.absdiff(current_resized, last_resized)
-        diff_percentage = (np.sum(diff > 30) / diff.size) * 100
-        
-        # Screen changed if >15% of pixels are significantly different
-        return diff_percentage > 15.0
-
-    def detect_victory_with_ocr(self, image):
-        """Hybrid detection: Visual banner + OCR text verification"""
-        
-        # Step 1: Visual banner detection (existing logic)
-        visual_detected, color_mask = self.detect_victory_colors(image)
-        
-        if not visual_detected:
-            return False, color_mask, "No visual banner detected"
-        
-        # Step 2: OCR verification in potential banner areas
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-        
-        # Find potential banner regions from color detection
-        blue_mask = cv2.inRange(hsv, np.array([100, 120, 120]), np.array([120, 255, 255]))
-        orange_mask = cv2.inRange(hsv, np.array([12, 120, 120]), np.array([22, 255, 255]))
-        combined_mask = cv2.bitwise_or(blue_mask, orange_mask)
-        
-        # Get bounding boxes of potential banners
-        contours, _ = cv2.findContours(combined_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        img_height, img_width = image.shape[:2]
-        victory_text_found = False
-        
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if area > self.min_area:
-                rect = cv2.boundingRect(contour)
-                x, y, w, h = rect
-                
-                # Expand search area around banner for text
-                search_x1 = max(0, x - 20)
-                search_y1 = max(0, y - 20)
-                search_x2 = min(img_width, x + w + 20)
-                search_y2 = min(img_height, y + h + 20)
-                
-                # Extract region of interest
-                roi = image[search_y1:search_y2, search_x1:search_x2]
-                
-                if roi.size > 0:
-                    try:
-                        # Run OCR on the banner region
-                        results = self.ocr_reader.readtext(roi, detail=1, paragraph=False)
-                        
-                        detected_text = ""
-                        for (bbox, text, confidence) in results:
-                            if confidence > 0.5:  # Only consider confident detections
-                                detected_text += text.upper() + " "
-                        
-                        print(f"🔤 OCR detected: '{detected_text.strip()}' (confidence threshold: 0.5)")
-                        
-                        # Check for victory royale text patterns
-                        victory_patterns = [
-                            "VICTORY ROYALE",
-                            "VICTORY",
-                            "ROYALE" 
-                        ]
-                        
-                        # Must contain both VICTORY and ROYALE (can be separate)
-                        has_victory = any("VICTORY" in detected_text for pattern in victory_patterns if "VICTORY" in pattern)
-                        has_royale = any("ROYALE" in detected_text for pattern in victory_patterns if "ROYALE" in pattern)
-                        
-                        if has_victory and has_royale:
-                            victory_text_found = True
-                            print("✅ OCR confirmed: Found 'VICTORY' and 'ROYALE' text!")
-                            break
-                        elif "VICTORY ROYALE" in detected_text:
-                            victory_text_found = True
-                            print("✅ OCR confirmed: Found 'VICTORY ROYALE' text!")
-                            break
-                            
-                    except Exception as e:
-                        print(f"⚠️ OCR error in region: {e}")
-                        continue
-        
-        if victory_text_found:
-            return True, color_mask, "Visual banner + OCR text confirmed"
-        else:
-            return False, color_mask, "Visual banner found but no 'VICTORY ROYALE' text detected"
-    
-    def detect_victory_colors(self, image):
-        """Detect victory royale banner colors and patterns in image - STRICT MODE"""
-        # Convert to HSV for better color detection
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-        
-        # More restrictive color ranges to avoid false positives
-        # Blue victory banner - tighter range
-        blue_mask = cv2.inRange(hsv, np.array([100, 120, 120]), np.array([120, 255, 255]))
-        
-        # Orange victory banner - tighter range  
-        orange_mask = cv2.inRange(hsv, np.array([12, 120, 120]), np.array([22, 255, 255]))
-        
-        # White text detection - very specific
-        white_mask = cv2.inRange(hsv, np.array([0, 0, 220]), np.array([180, 25, 255]))
-        
-        # Combine color masks
-        color_mask = cv2.bitwise_or(blue_mask, orange_mask)
-        
-        # Much more aggressive morphological operations to find banner shapes
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (30, 8))
-        color_mask = cv2.morphologyEx(color_mask, cv2.MORPH_CLOSE, kernel)
-        
-        # Find contours
-        contours, _ = cv2.findContours(color_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        victory_score = 0
-        banner_found = False
-        
-        # Much stricter banner detection
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if area > self.min_area * 2:  # Double the minimum area requirement
-                
-                # Check if contour is banner-shaped (wide rectangle)
-                rect = cv2.boundingRect(contour)
-                width, height = rect[2], rect[3]
-                aspect_ratio = width / height if height > 0 else 0
-                
-                # Victory banners must be very specifically shaped
-                if 3.0 < aspect_ratio < 5.5:
-                    
-                    # Check banner position (victory banners appear in upper-middle area)
-                    img_height, img_width = image.shape[:2]
-                    banner_y_center = rect[1] + rect[3]/2
-                    banner_x_center = rect[0] + rect[2]/2
-                    
-                    # Banner should be in upper 40% of screen and reasonably centered
-                    if (banner_y_center < img_height * 0.4 and 
-                        img_width * 0.2 < banner_x_center < img_width * 0.8):
-                        
-                        banner_found = True
-                        victory_score += 2
-                        
-                        # Look for "VICTORY ROYALE" text in and around the banner
-                        x, y, w, h = rect
-                        text_search_area = white_mask[max(0, y-20):min(img_height, y+h+20), 
-                                                    max(0, x-20):min(img_width, x+w+20)]
-                        
-                        white_pixels = np.sum(text_search_area > 0)
-                        if white_pixels > 2000:  # Substantial white text
-                            victory_score += 3
-                            
-                            # Additional check: look for text that spans most of banner width
-                            text_contours, _ = cv2.findContours(text_search_area, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-                            for text_contour in text_contours:
-                                text_rect = cv2.boundingRect(text_contour)
-                                text_width = text_rect[2]
-                                if text_width > w * 0.6:  # Text spans 60% of banner width
-                                    victory_score += 2
-                                    break
-        
-        # Much higher threshold - need strong evidence
-        is_victory = victory_score >= 4 and banner_found
-        
-        if victory_score > 0:
-            print(f"🔍 Detection score: {victory_score}/7 (need ≥4)")
         
-        return is_victory, color_mask
-    
+        # Compare fingerprints instead of full frames
+        distance = hamming_distance(frame_fingerprint(current_screen), self.last_fingerprint)
+        return distance > self.min_change_distance
+
     def take_screenshot(self):
         """Capture Fortnite window specifically, fallback to full screen"""
-        import win32gui
-        import win32ui
-        import win32con
-        
-        # Try to find Fortnite window first
-        fortnite_window = None
-        fortnite_titles = ["Fortnite", "FortniteClient-Win64-Shipping"]
-        
-        def enum_windows_callback(hwnd, titles):
-            window_title = win32gui.GetWindowText(hwnd)
-            for title in titles:
-                if title.lower() in window_title.lower() and win32gui.IsWindowVisible(hwnd):
-                    titles.append(hwnd)
-                    return False
-            return True
+        if self.capture is None:
+            self.capture = create_capture_backend()
+        screen = self.capture.grab()
         
-        window_handles = []
-        try:
-            win32gui.EnumWindows(enum_windows_callback, window_handles)
-            if window_handles:
-                fortnite_window = window_handles[0]
-        except:
-            pass
-        
-        # Capture Fortnite window if found
-        if fortnite_window:
-            try:
-                left, top, right, bottom = win32gui.GetWindowRect(fortnite_window)
-                width = right - left
-                height = bottom - top
-                
-                # Get window device context
-                hwndDC = win32gui.GetWindowDC(fortnite_window)
-                mfcDC = win32ui.CreateDCFromHandle(hwndDC)
-                saveDC = mfcDC.CreateCompatibleDC()
-                
-                # Create bitmap
-                saveBitMap = win32ui.CreateBitmap()
-                saveBitMap.CreateCompatibleBitmap(mfcDC, width, height)
-                saveDC.SelectObject(saveBitMap)
-                
-                # Copy window content
-                saveDC.BitBlt((0, 0), (width, height), mfcDC, (0, 0), win32con.SRCCOPY)
-                
-                # Convert to numpy array
-                bmpinfo = saveBitMap.GetInfo()
-                bmpstr = saveBitMap.GetBitmapBits(True)
-                img = np.frombuffer(bmpstr, dtype='uint8')
-                img.shape = (height, width, 4)
-                img = img[...,:3]  # Remove alpha channel
-                img = np.ascontiguousarray(img[:, :, ::-1])  # BGR to RGB, then flip
-                
-                # Cleanup
-                win32gui.DeleteObject(saveBitMap.GetHandle())
-                saveDC.DeleteDC()
-                mfcDC.DeleteDC()
-                win32gui.ReleaseDC(fortnite_window, hwndDC)
-                
-                print("📱 Captured Fortnite window")
-                return cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-                
-            except Exception as e:
-                print(f"⚠️ Failed to capture Fortnite window: {e}")
-        
-        # Fallback to full screen
-        print("🖥️ Capturing full screen (Fortnite window not found)")
-        screenshot = pyautogui.screenshot()
-        return cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+        # The sampling scheduler polls slowly while the game isn't running
+        self.window_found = self.capture.window_found
+        return screen
     
     def save_victory_screenshot(self, image):
-        """Save victory screenshot with timestamp"""
+        """Queue victory screenshot with timestamp for the writer thread (image must not be modified afterwards)"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"victory_{timestamp}.png"
         filepath = os.path.join(self.screenshot_folder, filename)
-        cv2.imwrite(filepath, image)
+        self.screenshot_writer.write(image, filepath)
         return filepath
     
     def show_victory_notification(self, filepath):
@@ -440,67 +577,202 @@ class VictoryDetector:
             print(f"🎉 VICTORY ROYALE DETECTED! Screenshot: {filepath}")
             print(f"⚠️ Notification error: {e}")
     
-    def start_detection(self):
-        """Start continuous screen monitoring with smart cooldown"""
+    def analyze_frame(self, screen, current_time):
+        """
+        Run cooldown bookkeeping and detection on one captured frame.
+        
+        Returns (screen, reason, details) when a new victory is detected, otherwise None.
+        """
+        if not self.first_frame_analyzed:
+            self.first_frame_analyzed = True
+            self.startup_timings['first analyzed frame'] = time.perf_counter() - self.started_at
+            print(f"⏱️ First frame analyzed {self.startup_timings['first analyzed frame']:.2f}s after start")
+        
+        self.last_frame_candidate = False  # Only a freshly analyzed candidate keeps the scheduler bursting
+        self.metrics.frames.inc()
+        
+        # Check cooldown status
+        if self.cooldown_active:
+            self.metrics.frames_skipped.inc()
+            if current_time - self.last_detection_time >= 60:  # 60 second cooldown
+                if self.screen_changed_significantly(screen):
+                    print("✅ Screen changed significantly. Detection resumed!")
+                    self.cooldown_active = False
+                    self.waiting_for_screen_change = False
+                elif not self.waiting_for_screen_change:
+                    print("⏳ Cooldown finished. Waiting for screen to change...")
+                    self.waiting_for_screen_change = True
+            return None
+        
+        # Normal detection - now using hybrid OCR method
+        if not self.change_tracker.banner_zone_changed(screen) and self.last_verdict is not None:
+            # Same zone as the last verdict: a static near-miss (lobby art) isn't a new candidate
+            self.metrics.frames_skipped.inc()
+            return None
+        self.change_tracker.mark_analyzed()
+        
+        detection_start = time.perf_counter()
+        victory_detected, mask, reason = self.detect_victory_with_ocr(screen)
+        detection_ms = (time.perf_counter() - detection_start) * 1000
+        self.metrics.observe_stages(self.last_analysis.timings)
+        final_verdict = "still loading" not in reason and "timed out" not in reason
+        self.last_verdict = (victory_detected, mask, reason) if final_verdict and not victory_detected else None
+        self.last_frame_candidate = victory_detected or "Visual banner found" in reason
+        if self.last_frame_candidate:
+            self.metrics.candidates.inc()
+        
+        if victory_detected:
+            print(f"🏆 VICTORY ROYALE DETECTED! Reason: {reason}")
+            self.metrics.victories.inc()
+            
+            # Start cooldown right away so later frames aren't detected again
+            # Store this screen's fingerprint for comparison
+            self.last_fingerprint = frame_fingerprint(screen)
+            # Capture buffers are reused, so keep a copy for saving/posting
+            screen = screen.copy()
+            self.last_detection_time = current_time
+            self.cooldown_active = True
+            
+            duplicate = self.fingerprint_store.find_duplicate(self.last_fingerprint)
+            if duplicate:
+                print(f"🔁 Already handled this win ({duplicate[2] or 'earlier session'}), not posting again")
+                return None
+            details = {'score': self.last_score, 'detection_ms': detection_ms,
+                       'fingerprint': self.last_fingerprint, 'capture_time': current_time}
+            return screen, reason, details
+        elif "Visual banner found" in reason:
+            print(f"⚠️ Near miss: {reason}")
+            self.metrics.near_misses.inc()
+        
+        return None
+    
+    def act_on_victory(self, screen, reason, details=None):
+        """Save the victory screenshot, record it in the history and handle it based on preferences"""
+        details = details or {}
+        with self.metrics.time('save'):
+            filepath = self.save_victory_screenshot(screen)
+        print(f"📸 Saving screenshot: {filepath}")
+        
+        # Pre-roll clip of the seconds leading up to the win, encoded in the background
+        if self.clip_recorder:
+            self.clip_recorder.export(os.path.splitext(filepath)[0], until=details.get('capture_time'))
+        
+        fingerprint = details.get('fingerprint')
+        if fingerprint is None:
+            fingerprint = frame_fingerprint(screen)
+        victory_id = self.history.record_victory(
+            filepath,
+            reason=reason,
+            score=details.get('score'),
+            detection_ms=details.get('detection_ms'),
+            fingerprint=fingerprint_hex(fingerprint)
+        )
+        self.fingerprint_store.add(fingerprint, filepath)
+        
+        # Handle based on preferences on a job worker
+        self.jobs.enqueue('victory', f"victory:{victory_id}", {'filepath': filepath, 'victory_id': victory_id})
+        self.job_workers.wake()
+        print(f"🗂️ Victory #{victory_id} queued for posting")
+        
+        print("🔒 Detection paused for 60 seconds + screen change...")
+    
+    def start_detection(self, scheduler=None, metrics_port=None, metrics_json=None, profile_frames=0):
+        """
+        Start continuous screen monitoring with smart cooldown.
+        
+        metrics_port serves Prometheus metrics on localhost, metrics_json is
+        rewritten with a snapshot at every stats report, and profile_frames
+        profiles that many frames right away (more can be requested through
+        the metrics endpoint at /profile?frames=N).
+        """
         self.running = True
+        self.started_at = time.perf_counter()
         print("🎯 Starting Victory Royale detection...")
         print("🎮 Go get those wins!")
         print("⏹️  Press Ctrl+C to stop")
         
+        # Capture, analysis and victory handling run on separate threads so a
+        # slow OCR pass or LinkedIn post never changes the capture cadence.
+        # The scheduler picks the cadence: slow without a game window, faster
+        # right after a candidate banner, always within the CPU budget.
+        pipeline = DetectionPipeline(self, scheduler=scheduler or AdaptiveScheduler(), metrics_json=metrics_json)
+        
+        server = None
+        if metrics_port:
+            try:
+                server = MetricsServer(self.metrics, port=metrics_port, profiler=self.profiler).start()
+            except OSError as e:
+                print(f"⚠️ Could not start metrics server on port {metrics_port}: {e}")
+        if profile_frames:
+            try:
+                self.profiler.request(profile_frames)
+            except ValueError as e:
+                print(f"⚠️ Not profiling: {e}")
+        
+        # Also picks up jobs left over from the last run
+        self.history.release_stale_claims()
+        self.job_workers.start()
+        
         try:
-            while self.running:
-                current_time = time.time()
-                screen = self.take_screenshot()
-                
-                # Check cooldown status
-                if self.cooldown_active:
-                    if current_time - self.last_detection_time >= 60:  # 60 second cooldown
-                        if self.screen_changed_significantly(screen):
-                            print("✅ Screen changed significantly. Detection resumed!")
-                            self.cooldown_active = False
-                            self.waiting_for_screen_change = False
-                        elif not self.waiting_for_screen_change:
-                            print("⏳ Cooldown finished. Waiting for screen to change...")
-                            self.waiting_for_screen_change = True
-                else:
-                    # Normal detection - now using hybrid OCR method
-                    victory_detected, mask, reason = self.detect_victory_with_ocr(screen)
-                    
-                    if victory_detected:
-                        print(f"🏆 VICTORY ROYALE DETECTED! Reason: {reason}")
-                        
-                        # Save screenshot and start cooldown
-                        filepath = self.save_victory_screenshot(screen)
-                        print(f"📸 Screenshot saved: {filepath}")
-                        
-                        # Store this screenshot for comparison
-                        self.last_screenshot = screen.copy()
-                        self.last_detection_time = current_time
-                        self.cooldown_active = True
-                        
-                        # Handle based on preferences
-                        self.handle_victory_detection(filepath)
-                        
-                        print("🔒 Detection paused for 60 seconds + screen change...")
-                    elif "Visual banner found" in reason:
-                        print(f"⚠️ Near miss: {reason}")
-                
-                # Small delay to prevent excessive CPU usage
-                time.sleep(0.5)
-                
+            pipeline.run()
         except KeyboardInterrupt:
             print("\n🛑 Detection stopped!")
+        finally:
             self.running = False
+            if server:
+                server.stop()
+            self.job_workers.stop()
+            print(f"🗂️ {self.job_workers.summary()}")
+            self.close()
+    
+    def close(self):
+        """Flush queued screenshots, stop background OCR workers and release the capture session"""
+        self.screenshot_writer.close()
+        if self.post_pool:
+            self.post_pool.stop()
+        if self.clip_recorder:
+            self.clip_recorder.close()
+        super().close()
+        if self.capture:
+            self.capture.close()
+    
+    def run_victory_job(self, payload, job):
+        """Job handler for a queued victory; raising makes the queue retry it later"""
+        def save_details(extra_details):
+            # Kept with the job, so a retry (e.g. after a failed generation) doesn't ask again
+            self.jobs.update_payload(job['id'], dict(payload, extra_details=extra_details))
+        
+        with self.metrics.time('handling'):
+            handled = self.handle_victory_detection(payload['filepath'], payload.get('victory_id'),
+                                                    payload.get('extra_details'), on_details=save_details)
+        if not handled:
+            raise RuntimeError(f"victory #{payload.get('victory_id')} not handled yet")
     
-    def handle_victory_detection(self, filepath):
-        """Handle victory based on user preferences"""
-        extra_details = None
+    def handle_victory_detection(self, filepath, victory_id=None, extra_details=None, on_details=None):
+        """
+        Handle victory based on user preferences.
+        
+        Safe to run again for the same victory (job retries): a post already
+        in the history is reused and a post already made isn't made twice.
+        extra_details are game details typed on an earlier attempt; details
+        typed now are passed to on_details(extra_details) so they can be kept.
+        Returns False if generation or LinkedIn automation failed.
+        """
+        history_hint = f"python victory_history.py show {victory_id}"
+        
+        record = self.history.get(victory_id) if victory_id is not None else None
+        if record and record['post_status'] in (VictoryHistory.POSTED, VictoryHistory.PREPARED):
+            print(f"✅ Victory #{victory_id} was already {record['post_status']}")
+            return True
+        
+        generated_post = record['post_text'] if record else None
         
-        # Request extra details if configured
-        if self.preferences['request_extra_details']:
-            print("\n🎮 Enter game details (or press Enter to skip):")
-            kills = input("  Eliminations: ").strip()
-            mode = input("  Game mode (Solos/Duos/Squads/etc): ").strip()
+        # Request extra details if configured (one prompt at a time across job workers)
+        if self.preferences['request_extra_details'] and not generated_post and extra_details is None:
+            with self.interaction_lock:
+                print(f"\n🎮 Enter game details for {os.path.basename(filepath)} (or press Enter to skip):")
+                kills = input("  Eliminations: ").strip()
+                mode = input("  Game mode (Solos/Duos/Squads/etc): ").strip()
             
             extra_details = {}
             if kills:
@@ -511,17 +783,32 @@ class VictoryDetector:
             if mode:
                 extra_details['mode'] = mode
             extra_details['placement'] = 1  # Always #1 for Victory Royale!
-        
-        generated_post = None
+            if on_details:
+                on_details(extra_details)
         
         # Generate post if configured
-        if self.preferences['generate_immediately'] and self.post_generator:
-            print("📝 Generating LinkedIn post...")
-            personality = self.preferences.get('personality_mode', 'business_bro')
-            generated_post = self.post_generator.generate_post(
-                personality=personality,
-                extra_details=extra_details
-            )
+        stream = None
+        personality = self.preferences.get('personality_mode', 'business_bro')
+        if not generated_post and self.preferences['generate_immediately'] and self.post_generator:
+            if self.post_pool:
+                generated_post = self.post_pool.take(personality, extra_details)
+                if generated_post:
+                    print("⚡ Using a pre-generated post")
+            if not generated_post and self.stream_posts:
+                # Printed (and typed into the LinkedIn composer) as the tokens arrive;
+                # stored in the history once it's complete, below
+                stream = self.post_generator.stream_post(personality=personality, extra_details=extra_details)
+                preview = threading.Thread(target=self.print_post_stream, args=(stream,),
+                                           name="post-preview", daemon=True)
+                preview.start()
+            elif not generated_post:
+                print("📝 Generating LinkedIn post...")
+                start = time.perf_counter()
+                generated_post = self.post_generator.generate_post(
+                    personality=personality,
+                    extra_details=extra_details
+                )
+                self.metrics.observe('llm_total', time.perf_counter() - start)
             
             if generated_post:
                 print("\n" + "="*60)
@@ -530,51 +817,135 @@ class VictoryDetector:
                 print(generated_post)
                 print("="*60 + "\n")
                 
-                # Save post to file
-                post_filename = filepath.replace('.png', '_post.txt')
-                with open(post_filename, 'w', encoding='utf-8') as f:
-                    f.write(generated_post)
-                print(f"💾 Post saved to: {post_filename}")
+                # Save post with the victory's history row
+                if victory_id is not None:
+                    self.history.set_post(victory_id, personality, generated_post)
+                    print(f"💾 Post saved to victory history (#{victory_id})")
+            elif stream is None:
+                return False
+        
+        success = True
+        post_content = generated_post or stream
         
         # Handle LinkedIn automation
         automation_mode = self.preferences.get('linkedin_automation', 'manual')
         
-        if generated_post and automation_mode != 'manual':
+        if self.preferences.get('review_later'):
+            # Posted later in one browser session by batch_review.py
+            print(f"\n🗂️ Victory #{victory_id} saved for batch review (python batch_review.py)")
+        
+        elif post_content and automation_mode != 'manual' and not self.claim_for_posting(victory_id):
+            # batch_review.py has it; the retry sees how that went
+            print(f"⏭️ Victory #{victory_id} is being posted elsewhere (batch review)")
+            success = False
+        
+        elif post_content and automation_mode != 'manual':
             print(f"\n🤖 LinkedIn automation mode: {automation_mode}")
             
+            # The writer thread may still be encoding the screenshot we're about to upload
+            self.screenshot_writer.wait(filepath)
+            
+            # One Chrome session at a time, and no prompts from other wins meanwhile
+            self.interaction_lock.acquire()
             try:
+                # Imported here so Selenium/pyautogui are only needed when automating
+                from linkedin_poster import post_victory_full_auto, post_victory_semi_auto
+                
                 if automation_mode == 'full-auto':
                     print("🚀 Posting to LinkedIn automatically...")
-                    success = post_victory_full_auto(generated_post, filepath)  # Pass the actual screenshot path!
+                    success = post_victory_full_auto(post_content, filepath)  # Pass the actual screenshot path!
                     if success:
                         print("✅ Posted to LinkedIn successfully!")
+                        self.record_post_status(victory_id, VictoryHistory.POSTED, "full-auto: posted")
                     else:
                         print("❌ LinkedIn posting failed")
+                        self.record_post_status(victory_id, VictoryHistory.FAILED, "full-auto: posting failed")
                         
                 elif automation_mode == 'semi-auto':
                     print("🚀 Opening LinkedIn for semi-auto posting...")
-                    success = post_victory_semi_auto(generated_post, filepath)  # Pass the actual screenshot path!
+                    success = post_victory_semi_auto(post_content, filepath)  # Pass the actual screenshot path!
                     if success:
                         print("✅ Post prepared on LinkedIn!")
+                        self.record_post_status(victory_id, VictoryHistory.PREPARED, "semi-auto: post prepared")
                     else:
                         print("❌ LinkedIn automation failed")
+                        self.record_post_status(victory_id, VictoryHistory.FAILED, "semi-auto: automation failed")
                         
             except Exception as e:
+                success = False
                 print(f"❌ LinkedIn automation error: {e}")
+                self.record_post_status(victory_id, VictoryHistory.FAILED, f"{automation_mode}: {e}")
                 print(f"📋 Post text and screenshot saved - you can post manually!")
                 print(f"   Screenshot: {filepath}")
-                print(f"   Post text: {post_filename}")
+                print(f"   Post text: {history_hint}")
+            finally:
+                self.interaction_lock.release()
         
-        elif generated_post and automation_mode == 'manual':
+        elif post_content and automation_mode == 'manual':
+            self.record_post_status(victory_id, VictoryHistory.MANUAL, "manual: waiting for user")
             print(f"\n📋 Manual mode: Post generated and saved!")
             print(f"   Screenshot: {filepath}")
-            print(f"   Post text: {post_filename}")
+            print(f"   Post text: {history_hint}")
+        
+        if stream is not None:
+            preview.join()
+            if not self.finish_post_stream(stream, victory_id, personality):
+                success = False
         
         # Show notification
         self.show_victory_notification(filepath)
+        return success
+    
+    def print_post_stream(self, stream):
+        """Console preview of a post while it's being generated"""
+        print("\n" + "="*60)
+        print("GENERATED POST (streaming):")
+        print("="*60)
+        try:
+            for chunk in stream:
+                print(chunk, end="", flush=True)
+        except RuntimeError:
+            pass  # Already reported by the stream
+        print("\n" + "="*60 + "\n")
+    
+    def finish_post_stream(self, stream, victory_id, personality):
+        """Wait for a streamed post, record its timings and store it; False if generation failed"""
+        post_text = stream.text()
+        self.metrics.observe('llm_total', stream.total_seconds)
+        if stream.first_content_seconds is not None:
+            self.metrics.observe('llm_first_content', stream.first_content_seconds)
+            print(f"⚡ First words after {stream.first_content_seconds * 1000:.0f} ms, "
+                  f"full post after {stream.total_seconds:.1f}s")
+        if post_text is None:
+            return False
+        if victory_id is not None:
+            self.history.set_post(victory_id, personality, post_text)
+            print(f"💾 Post saved to victory history (#{victory_id})")
+        return True
+    
+    def claim_for_posting(self, victory_id):
+        """Mark the win as being posted, so batch_review.py can't post it at the same time"""
+        if victory_id is None:
+            return True
+        return self.history.claim(victory_id, (VictoryHistory.PENDING, VictoryHistory.GENERATED,
+                                               VictoryHistory.MANUAL, VictoryHistory.FAILED))
+    
+    def record_post_status(self, victory_id, status, automation_result):
+        if victory_id is not None:
+            self.history.set_status(victory_id, status, automation_result)
 
 def main():
-    detector = VictoryDetector()
+    png_compression = os.environ.get("VICTORY_PNG_COMPRESSION")
+    cascade_width = os.environ.get("VICTORY_CASCADE_WIDTH")
+    detector = VictoryDetector(
+        cascade_width=int(cascade_width) if cascade_width else None,
+        png_compression=int(png_compression) if png_compression else None,
+        clip_seconds=float(os.environ.get("VICTORY_CLIP_SECONDS", "5")),
+        clip_format=os.environ.get("VICTORY_CLIP_FORMAT", "mp4"),
+        job_workers=int(os.environ.get("VICTORY_JOB_WORKERS", "2")),
+        post_pool_size=int(os.environ.get("VICTORY_POST_POOL", "0")),
+        stream_posts=os.environ.get("VICTORY_STREAM_POSTS", "1") != "0"
+    )
     
     print("=" * 50)
     print("🎉 FORTNITE VICTORY ROYALE DETECTOR 🎉")
@@ -612,8 +983,13 @@ def main():
         print("\nReady for live detection? Press Enter...")
         input()
     
-    # Start live detection
-    detector.start_detection()
+    # Start live detection (metrics/profiling are opt-in through the environment)
+    detector.profiler.use_pyinstrument = os.environ.get("VICTORY_PROFILER") == "pyinstrument"
+    detector.start_detection(
+        metrics_port=int(os.environ.get("VICTORY_METRICS_PORT", "0")),
+        metrics_json=os.environ.get("VICTORY_METRICS_JSON"),
+        profile_frames=int(os.environ.get("VICTORY_PROFILE_FRAMES", "0"))
+    )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
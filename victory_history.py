@@ -0,0 +1,342 @@
+import glob
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib.request import pathname2url
+
+SCHEMA_VERSION = 4
+
+IMPORTED_REASON = "Imported from screenshot folder"
+# Reason BannerDetector gives a win EasyOCR read as VICTORY ROYALE
+OCR_CONFIRMED_REASON = "Visual banner + OCR text confirmed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS victories (
+    id INTEGER PRIMARY KEY,
+    detected_at REAL NOT NULL,
+    image_path TEXT UNIQUE,
+    reason TEXT,
+    score INTEGER,
+    detection_ms REAL,
+    fingerprint TEXT,
+    personality TEXT,
+    post_text TEXT,
+    post_status TEXT NOT NULL DEFAULT 'pending',
+    automation_result TEXT,
+    posted_at REAL,
+    claimed_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_victories_time ON victories(detected_at);
+CREATE INDEX IF NOT EXISTS idx_victories_personality ON victories(personality, detected_at);
+CREATE INDEX IF NOT EXISTS idx_victories_status ON victories(post_status, detected_at);
+CREATE INDEX IF NOT EXISTS idx_victories_fingerprint ON victories(fingerprint);
+CREATE INDEX IF NOT EXISTS idx_victories_unposted ON victories(detected_at) WHERE post_status != 'posted';
+"""
+
+
+def parse_screenshot_time(filename):
+    """Timestamp of a victory_YYYYmmdd_HHMMSS.png file name, or None"""
+    try:
+        return datetime.strptime(os.path.basename(filename)[8:23], "%Y%m%d_%H%M%S").timestamp()
+    except ValueError:
+        return None
+
+
+def confirmed_screenshots(path=os.path.join("victory_screenshots", "victories.db"), limit=12):
+    """
+    Newest screenshots of wins EasyOCR confirmed, for the template bank.
+
+    Opens the database read-only, so offline tools never create one, and
+    returns [] while there is none.
+    """
+    if not os.path.exists(path):
+        return []
+    connection = sqlite3.connect(f"file:{pathname2url(os.path.abspath(path))}?mode=ro", uri=True, timeout=30.0)
+    try:
+        rows = connection.execute(
+            "SELECT image_path FROM victories WHERE reason = ? AND image_path IS NOT NULL "
+            "ORDER BY detected_at DESC LIMIT ?", (OCR_CONFIRMED_REASON, limit * 2)
+        ).fetchall()
+    except sqlite3.Error:
+        return []  # Not migrated yet
+    finally:
+        connection.close()
+    return [row[0] for row in rows if os.path.exists(row[0])][:limit]
+
+
+class VictoryHistory:
+    """
+    SQLite index of every detected victory.
+
+    One row per win holds the detection (time, reason, score, timing,
+    fingerprint), the generated post (personality, text) and what happened to
+    it (post_status: pending, generated, posting, prepared, posted, failed,
+    manual, dismissed or imported). A win is claimed (posting) before anything
+    opens LinkedIn for it, so a batch review and a live job never post it twice.
+    Screenshots stay on disk as PNG files and rows point at them. A new
+    database imports the existing screenshot folder on first open; those wins
+    were already handled by the old detector, so they are imported, which
+    nothing posts or generates for.
+    """
+
+    PENDING = 'pending'
+    GENERATED = 'generated'
+    POSTING = 'posting'
+    PREPARED = 'prepared'
+    POSTED = 'posted'
+    FAILED = 'failed'
+    MANUAL = 'manual'
+    DISMISSED = 'dismissed'
+    IMPORTED = 'imported'
+
+    def __init__(self, path=os.path.join("victory_screenshots", "victories.db"), folder="victory_screenshots"):
+        self.path = path
+        self.folder = folder
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        # One connection shared by the pipeline threads, serialized by the lock.
+        # The timeout covers another process holding the write lock while it
+        # imports the screenshot folder into a new database
+        self.connection = sqlite3.connect(path, check_same_thread=False, timeout=30.0)
+        self.connection.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            # Version check, schema, first import and version bump are one write
+            # transaction, so processes opening a new database at the same time
+            # wait for the first one instead of all importing the folder
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+                imported = 0
+                if version < SCHEMA_VERSION:
+                    # executescript() would commit the transaction, so one statement at a time
+                    for statement in SCHEMA.split(';'):
+                        if statement.strip():
+                            self.connection.execute(statement)
+                    if 0 < version < 2:
+                        self.connection.execute("ALTER TABLE victories ADD COLUMN claimed_at REAL")
+                    if 0 < version < 3:
+                        # Earlier versions imported old wins as waiting for review
+                        self.connection.execute(
+                            "UPDATE victories SET post_status = ? WHERE reason = ? AND post_status IN (?, ?)",
+                            (self.IMPORTED, IMPORTED_REASON, self.PENDING, self.GENERATED)
+                        )
+                    if version == 0:
+                        # Wins from the last few hours get fingerprinted for duplicate checks
+                        imported = self.insert_screenshots(folder, fingerprint_since=time.time() - 6 * 3600)
+                    self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                self.connection.commit()
+            except Exception:
+                self.connection.rollback()
+                raise
+        if imported:
+            print(f"🗃️ Imported {imported} saved victories into {path}")
+
+    def record_victory(self, image_path, reason=None, score=None, detection_ms=None,
+                       fingerprint=None, detected_at=None):
+        """Add a detected victory and return its id"""
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO victories (detected_at, image_path, reason, score, detection_ms, fingerprint) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (detected_at or time.time(), image_path, reason, score, detection_ms, fingerprint)
+            )
+            return cursor.lastrowid
+
+    def set_post(self, victory_id, personality, post_text):
+        """Store the generated post (a pending win becomes generated; a later status is kept)"""
+        with self.lock, self.connection:
+            self.connection.execute(
+                "UPDATE victories SET personality = ?, post_text = ?, "
+                "post_status = CASE WHEN post_status = ? THEN ? ELSE post_status END WHERE id = ?",
+                (personality, post_text, self.PENDING, self.GENERATED, victory_id)
+            )
+
+    def set_status(self, victory_id, status, automation_result=None):
+        posted_at = time.time() if status == self.POSTED else None
+        with self.lock, self.connection:
+            self.connection.execute(
+                "UPDATE victories SET post_status = ?, automation_result = ?, "
+                "posted_at = COALESCE(?, posted_at) WHERE id = ?",
+                (status, automation_result, posted_at, victory_id)
+            )
+
+    def claim(self, victory_id, statuses):
+        """Move a win whose post_status is one of statuses to posting; False if it's taken or done"""
+        placeholders = ", ".join("?" * len(statuses))
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                f"UPDATE victories SET post_status = ?, claimed_at = ? WHERE id = ? AND post_status IN ({placeholders})",
+                (self.POSTING, time.time(), victory_id, *statuses)
+            )
+            return cursor.rowcount == 1
+
+    def release(self, victory_id, status):
+        """Give up a claim that didn't end in set_status(), putting the win back to status"""
+        with self.lock, self.connection:
+            self.connection.execute(
+                "UPDATE victories SET post_status = ? WHERE id = ? AND post_status = ?",
+                (status, victory_id, self.POSTING)
+            )
+
+    def release_stale_claims(self, older_than=3600):
+        """Claims left by a process that died mid-post become failed, so they can be retried; returns how many"""
+        with self.lock, self.connection:
+            return self.connection.execute(
+                "UPDATE victories SET post_status = ?, automation_result = 'claim expired' "
+                "WHERE post_status = ? AND claimed_at < ?",
+                (self.FAILED, self.POSTING, time.time() - older_than)
+            ).rowcount
+
+    def get(self, victory_id):
+        with self.lock:
+            return self.connection.execute("SELECT * FROM victories WHERE id = ?", (victory_id,)).fetchone()
+
+    def recent(self, limit=20):
+        with self.lock:
+            return self.connection.execute(
+                "SELECT * FROM victories ORDER BY detected_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+
+    def unposted(self, since=None, limit=100):
+        """Wins that were never posted, newest first (e.g. since=time.time() - 7 * 86400)"""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT * FROM victories WHERE post_status != 'posted' AND detected_at >= ? "
+                "ORDER BY detected_at DESC LIMIT ?", (since or 0, limit)
+            ).fetchall()
+
+    def by_status(self, statuses, since=None, limit=500):
+        """Wins whose post_status is one of statuses, oldest first"""
+        placeholders = ", ".join("?" * len(statuses))
+        with self.lock:
+            return self.connection.execute(
+                f"SELECT * FROM victories WHERE post_status IN ({placeholders}) AND detected_at >= ? "
+                "ORDER BY detected_at LIMIT ?", (*statuses, since or 0, limit)
+            ).fetchall()
+
+    def fingerprints_since(self, since):
+        """(detected_at, fingerprint hex, image file name) for fingerprinted wins since a time, oldest first"""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT detected_at, fingerprint, image_path FROM victories "
+                "WHERE detected_at >= ? AND fingerprint IS NOT NULL ORDER BY detected_at", (since,)
+            ).fetchall()
+        return [(row[0], row[1], os.path.basename(row[2]) if row[2] else None) for row in rows]
+
+    def latest_image_path(self):
+        """Most recent screenshot that still exists on disk, or None"""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT image_path FROM victories WHERE image_path IS NOT NULL ORDER BY detected_at DESC LIMIT 20"
+            ).fetchall()
+        for row in rows:
+            if os.path.exists(row[0]):
+                return row[0]
+        return None
+
+    def count(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM victories").fetchone()[0]
+
+    def import_folder(self, folder, fingerprint_since=None):
+        """Import victory_*.png screenshots (with their _post.txt) that aren't indexed yet"""
+        with self.lock, self.connection:
+            return self.insert_screenshots(folder, fingerprint_since)
+
+    def insert_screenshots(self, folder, fingerprint_since=None):
+        """
+        Add rows for screenshots in folder that aren't indexed yet (call with the lock held).
+
+        Fingerprints come from fingerprints.jsonl when the folder has one;
+        screenshots newer than fingerprint_since without one are fingerprinted
+        from the image (older wins don't matter for duplicate checks).
+        """
+        known_fingerprints = {}
+        fingerprint_file = os.path.join(folder, "fingerprints.jsonl")
+        if os.path.exists(fingerprint_file):
+            with open(fingerprint_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        known_fingerprints[record['screenshot']] = record['fingerprint']
+                    except (ValueError, KeyError):
+                        continue
+
+        indexed = {row[0] for row in self.connection.execute("SELECT image_path FROM victories")}
+
+        rows = []
+        for image_path in sorted(glob.glob(os.path.join(folder, 'victory_*.png'))):
+            detected_at = parse_screenshot_time(image_path)
+            if image_path in indexed or detected_at is None:
+                continue
+
+            post_text = None
+            post_path = image_path.replace('.png', '_post.txt')
+            if os.path.exists(post_path):
+                with open(post_path, 'r', encoding='utf-8') as f:
+                    post_text = f.read()
+
+            fingerprint = known_fingerprints.get(os.path.basename(image_path))
+            if fingerprint is None and fingerprint_since is not None and detected_at >= fingerprint_since:
+                import cv2
+                from fingerprint_store import frame_fingerprint, fingerprint_hex
+                image = cv2.imread(image_path)
+                if image is not None:
+                    fingerprint = fingerprint_hex(frame_fingerprint(image))
+
+            rows.append((detected_at, image_path, IMPORTED_REASON, fingerprint, post_text, self.IMPORTED))
+
+        if not rows:
+            return 0
+        # Rows another process added meanwhile are kept as they are
+        cursor = self.connection.executemany(
+            "INSERT OR IGNORE INTO victories (detected_at, image_path, reason, fingerprint, post_text, post_status) "
+            "VALUES (?, ?, ?, ?, ?, ?)", rows
+        )
+        return cursor.rowcount
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+def print_rows(rows):
+    for row in rows:
+        when = datetime.fromtimestamp(row['detected_at']).strftime("%Y-%m-%d %H:%M")
+        print(f"  #{row['id']:<5} {when}  {row['post_status']:<9}  {row['personality'] or '-':<18}  {row['image_path']}")
+
+
+def main():
+    history = VictoryHistory()
+    command = sys.argv[1] if len(sys.argv) > 1 else 'recent'
+
+    if command == 'recent':
+        print_rows(history.recent())
+    elif command == 'unposted':
+        days = float(sys.argv[2]) if len(sys.argv) > 2 else 7
+        print_rows(history.unposted(since=time.time() - days * 86400))
+    elif command == 'show' and len(sys.argv) > 2:
+        row = history.get(int(sys.argv[2]))
+        if row is None:
+            print("❌ No such victory")
+        else:
+            for key in row.keys():
+                print(f"{key}: {row[key]}")
+    elif command == 'import':
+        folder = sys.argv[2] if len(sys.argv) > 2 else history.folder
+        print(f"🗃️ Imported {history.import_folder(folder)} victories from {folder}")
+    else:
+        print("Usage: python victory_history.py [recent | unposted [days] | show <id> | import [folder]]")
+    print(f"📊 {history.count()} victories on record")
+    history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import argparse
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+# Detection-only detector owned by each worker process (created once in _init_worker)
+_worker_detector = None
+_worker_use_ocr = True
+
+
+def _init_worker(use_ocr, cascade_width):
+    global _worker_detector, _worker_use_ocr
+    # Parallelism comes from the processes; OpenCV's own threads would just compete
+    cv2.setNumThreads(1)
+    # Only the color/template/OCR checks: no victory history, job queue, post
+    # pool or background threads in each worker
+    from victory_detector import BannerDetector
+    with contextlib.redirect_stdout(io.StringIO()):
+        _worker_detector = BannerDetector(load_ocr=use_ocr, cascade_width=cascade_width, ocr_workers=0)
+        _worker_detector.warm_up_detection(use_ocr)
+    _worker_use_ocr = use_ocr
+
+
+def detect_frame(frame):
+    """Run the same checks as live detection on one decoded frame: (is_victory, reason)"""
+    # Detector stages print per-frame diagnostics; a scan would drown in them
+    with contextlib.redirect_stdout(io.StringIO()):
+        if _worker_use_ocr:
+            detected, _, reason = _worker_detector.detect_victory_with_ocr(frame)
+        else:
+            detected, _ = _worker_detector.detect_victory_colors(frame)
+            reason = "Visual banner detected" if detected else "No visual banner detected"
+    return detected, reason
+
+
+def scan_chunk(video_path, start_frame, end_frame, stride, seek_stride):
+    """
+    Scan frames [start_frame, end_frame) of a video, sampling every stride-th frame.
+
+    The chunk starts with a seek (OpenCV/FFmpeg jumps to the nearest keyframe
+    and decodes forward). Between samples, frames are skipped with grab(),
+    which decodes but doesn't convert them; strides of seek_stride frames or
+    more seek instead, since long GOPs make that cheaper than decoding every
+    frame. Returns (hits, frames_checked) where hits are (frame_index, frame, reason)
+    for the first frame of each run of consecutive victory samples.
+    """
+    video = cv2.VideoCapture(video_path)
+    video.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+    hits = []
+    checked = 0
+    in_victory = False
+    position = start_frame
+    try:
+        while position < end_frame:
+            ok, frame = video.read()
+            if not ok:
+                break
+            checked += 1
+
+            detected, reason = detect_frame(frame)
+            if detected and not in_victory:
+                hits.append((position, frame, reason))
+            in_victory = detected
+
+            position += stride
+            if stride >= seek_stride:
+                video.set(cv2.CAP_PROP_POS_FRAMES, position)
+            else:
+                for _ in range(stride - 1):
+                    if not video.grab():
+                        return hits, checked
+    finally:
+        video.release()
+    return hits, checked
+
+
+def format_timestamp(seconds):
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, secs = divmod(remainder, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+class VODScanner:
+    """
+    Finds every Victory Royale in a recorded gameplay video.
+
+    The video is split into chunks that worker processes scan in parallel,
+    each sampling one frame every sample_interval seconds with the normal
+    color/template/OCR checks. Hits closer than merge_gap seconds are the same
+    victory screen and are reported once.
+    """
+
+    def __init__(self, workers=None, sample_interval=1.0, merge_gap=10.0, use_ocr=True,
+                 cascade_width=None, chunks_per_worker=4, seek_interval=2.0,
+                 screenshot_folder="victory_screenshots"):
+        self.workers = workers or os.cpu_count() or 1
+        self.sample_interval = sample_interval
+        self.merge_gap = merge_gap
+        self.use_ocr = use_ocr
+        self.cascade_width = cascade_width
+        self.chunks_per_worker = chunks_per_worker
+        self.seek_interval = seek_interval
+        self.screenshot_folder = screenshot_folder
+
+    def scan(self, video_path):
+        """Scan a video and return [(seconds, screenshot_path, reason)] for each victory"""
+        video = cv2.VideoCapture(video_path)
+        if not video.isOpened():
+            raise ValueError(f"Could not open video {video_path}")
+        fps = video.get(cv2.CAP_PROP_FPS) or 30.0
+        total_frames = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+        video.release()
+
+        stride = max(1, round(self.sample_interval * fps))
+        seek_stride = max(1, round(self.seek_interval * fps))
+
+        if total_frames > 0:
+            duration = total_frames / fps
+            length = format_timestamp(duration)
+            # Chunk boundaries land on sampled frames so every chunk keeps the same cadence
+            chunk_count = max(1, min(self.workers * self.chunks_per_worker, total_frames // stride))
+            chunk_size = -(-total_frames // (chunk_count * stride)) * stride
+            chunks = [(start, min(start + chunk_size, total_frames))
+                      for start in range(0, total_frames, chunk_size)]
+        else:
+            # Some MKV/streamed recordings report no frame count, so there is
+            # nothing to split or seek by: one chunk read start to end
+            duration = None
+            length = "unknown length"
+            chunks = [(0, float('inf'))]
+            seek_stride = stride + 1
+
+        print(f"🎬 Scanning {os.path.basename(video_path)} ({length}, {fps:.0f} fps) "
+              f"in {len(chunks)} chunks on {self.workers} worker(s), one frame every {stride} "
+              f"({'color + OCR' if self.use_ocr else 'color only'})...")
+
+        start = time.perf_counter()
+        hits = []
+        frames_checked = 0
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.use_ocr, self.cascade_width)) as executor:
+            futures = [executor.submit(scan_chunk, video_path, chunk_start, chunk_end, stride, seek_stride)
+                       for chunk_start, chunk_end in chunks]
+            for done, future in enumerate(as_completed(futures), 1):
+                chunk_hits, checked = future.result()
+                hits.extend(chunk_hits)
+                frames_checked += checked
+                print(f"   {done}/{len(chunks)} chunks done, {len(hits)} hit(s) so far")
+        elapsed = time.perf_counter() - start
+
+        victories = []
+        last_seconds = None
+        for frame_index, frame, reason in sorted(hits, key=lambda hit: hit[0]):
+            seconds = frame_index / fps
+            if last_seconds is not None and seconds - last_seconds <= self.merge_gap:
+                last_seconds = seconds
+                continue
+            last_seconds = seconds
+            victories.append((seconds, self.save_frame(video_path, seconds, frame), reason))
+
+        if duration is None:
+            duration = frames_checked * stride / fps
+        speedup = duration / elapsed if elapsed else 0.0
+        print(f"⏱️ Scanned {frames_checked} frames in {elapsed:.1f}s ({speedup:.0f}x real time)")
+        return victories
+
+    def save_frame(self, video_path, seconds, frame):
+        os.makedirs(self.screenshot_folder, exist_ok=True)
+        video_name = os.path.splitext(os.path.basename(video_path))[0]
+        filename = f"vod_{video_name}_{format_timestamp(seconds).replace(':', '')}.png"
+        filepath = os.path.join(self.screenshot_folder, filename)
+        cv2.imwrite(filepath, frame)
+        return filepath
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find Victory Royales in recorded gameplay")
+    parser.add_argument('videos', nargs='+', help="Video files to scan (anything OpenCV/FFmpeg can read)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: one per CPU core)")
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help="Seconds between sampled frames (the banner stays up for several seconds)")
+    parser.add_argument('--merge-gap', type=float, default=10.0,
+                        help="Hits closer than this many seconds count as one victory")
+    parser.add_argument('--no-ocr', action='store_true',
+                        help="Color check only (faster, more false positives)")
+    parser.add_argument('--cascade-width', type=int, default=None,
+                        help="Run banner detection on frames downscaled to this width (e.g. 960)")
+    args = parser.parse_args()
+
+    scanner = VODScanner(workers=args.workers, sample_interval=args.interval, merge_gap=args.merge_gap,
+                         use_ocr=not args.no_ocr, cascade_width=args.cascade_width)
+    for video_path in args.videos:
+        victories = scanner.scan(video_path)
+        print(f"\n🏆 {len(victories)} Victory Royale(s) in {os.path.basename(video_path)}:")
+        for seconds, filepath, reason in victories:
+            print(f"   {format_timestamp(seconds)}  {filepath}  ({reason})")
+
+
+if __name__ == "__main__":
+    main()